@@ -0,0 +1,117 @@
+import threading
+
+# --- Admin dashboard queries ---
+# Charts are fed by GROUP BY queries on the indexed analyses columns and the
+# table is read one page at a time with keyset pagination (ID > last seen ID),
+# so nothing loads the whole table.
+
+ADMIN_PAGE_SIZE = 50
+# Dashboard name -> indexed column in analyses
+GROUPABLE_COLUMNS = {'Predicted_Field': 'predicted_field', 'User_level': 'user_level'}
+
+# analyses columns under the names the dashboard and exports have always used
+DISPLAY_COLUMNS = (
+    "a.ID AS ID, a.name AS Name, a.email AS Email_ID, a.resume_score AS resume_score, "
+    "a.created_at AS Timestamp, a.page_count AS Page_no, a.predicted_field AS Predicted_Field, "
+    "a.user_level AS User_level"
+)
+TRAILING_COLUMNS = "a.recommended_skills AS Recommended_skills, a.recommended_courses AS Recommended_courses"
+
+
+def display_query(database):
+    # Full table with skills folded back into one comma-separated column
+    if database.backend == 'sqlite':
+        skills = "(SELECT group_concat(s.display_name, ', ') FROM analysis_skills s WHERE s.analysis_id = a.ID)"
+    else:
+        skills = ("(SELECT GROUP_CONCAT(s.display_name ORDER BY s.display_name SEPARATOR ', ') "
+                  "FROM analysis_skills s WHERE s.analysis_id = a.ID)")
+    return f"SELECT {DISPLAY_COLUMNS}, {skills} AS Actual_skills, {TRAILING_COLUMNS} FROM analyses a ORDER BY a.ID"
+
+
+def _decode(value):
+    if isinstance(value, bytes):
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            return value
+    return value
+
+
+def data_version(database):
+    # MAX(ID) only reads the primary key index and changes whenever rows are added
+    rows = database.query("SELECT MAX(ID) FROM analyses")
+    return rows[0][0] or 0
+
+
+def count_by(database, column):
+    if column not in GROUPABLE_COLUMNS:
+        raise ValueError(f'Cannot group by {column!r}')
+    db_column = GROUPABLE_COLUMNS[column]
+    rows = database.query(f"SELECT {db_column}, COUNT(*) FROM analyses GROUP BY {db_column} ORDER BY COUNT(*) DESC")
+    return [(_decode(value), count) for value, count in rows]
+
+
+def _fetch(database, where, params):
+    # Returns (columns, rows) for the analyses matching `where`;
+    # Actual_skills comes back as a list from analysis_skills
+    with database.connection() as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute(database.sql(f"SELECT {DISPLAY_COLUMNS}, {TRAILING_COLUMNS} FROM analyses a {where}"),
+                        params)
+            columns = [d[0] for d in cur.description]
+            rows = [[_decode(v) for v in row] for row in cur.fetchall()]
+            skills = {}
+            if rows:
+                ids = [row[0] for row in rows]
+                cur.execute(database.sql("SELECT analysis_id, display_name FROM analysis_skills "
+                                         f"WHERE analysis_id IN ({', '.join(['%s'] * len(ids))})"), ids)
+                for analysis_id, name in cur.fetchall():
+                    skills.setdefault(analysis_id, []).append(_decode(name))
+        finally:
+            cur.close()
+    # Same column order as the export
+    split = columns.index('User_level') + 1
+    columns = columns[:split] + ['Actual_skills'] + columns[split:]
+    rows = [tuple(row[:split] + [skills.get(row[0], [])] + row[split:]) for row in rows]
+    return columns, rows
+
+
+def fetch_page(database, after_id=0, limit=ADMIN_PAGE_SIZE):
+    # Up to `limit` rows with ID > after_id
+    return _fetch(database, "WHERE a.ID > %s ORDER BY a.ID LIMIT %s", (after_id, limit))
+
+
+def fetch_rows(database, ids):
+    # Rows for the given IDs, in the order given
+    ids = list(ids)
+    if not ids:
+        return _fetch(database, "WHERE 1 = 0", ())
+    columns, rows = _fetch(database, f"WHERE a.ID IN ({', '.join(['%s'] * len(ids))})", ids)
+    order = {analysis_id: pos for pos, analysis_id in enumerate(ids)}
+    return columns, sorted(rows, key=lambda row: order[row[0]])
+
+
+class AggregateCache:
+    # Aggregates are reused until a new row shows up (MAX(ID) changes)
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def counts(self, database, column):
+        version = data_version(database)
+        with self._lock:
+            entry = self._entries.get(column)
+            if entry and entry[0] == version:
+                return entry[1]
+        counts = count_by(database, column)
+        with self._lock:
+            self._entries[column] = (version, counts)
+        return counts
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+
+aggregate_cache = AggregateCache()
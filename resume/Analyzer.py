@@ -0,0 +1,155 @@
+import hashlib
+import json
+from functools import lru_cache
+
+from Classifier import CLASSIFIER_MIN_SCORE, best_field, classify_text
+from Dedup import minhash
+from Extractor import extract_pdf
+from Matcher import KeywordMatcher
+from Parser import parse_resume
+from Sections import default_scorer, score_resume
+from Taxonomy import fields as FIELDS
+
+# --- UI-free analysis pipeline ---
+# Extraction, level detection, field recommendation and scoring, shared by the
+# app's analysis jobs (Jobs.py) and the batch CLI (Batch.py). Callers check the
+# analysis cache themselves; Jobs.py does so before handing a job to a worker.
+
+# Pipeline stages in order; App.py times 'save' and Jobs.py runs 'persist'
+STAGES = ('save', 'extract', 'dedup', 'nlp', 'match', 'score', 'persist')
+
+SKILL_WEIGHT = 2  # extra weight when a keyword is also in the extracted skill list
+# Below this keyword score (one full-weight keyword) the field is left to the
+# text classifier, so weak keywords such as 'solid' never decide it alone
+FIELD_MIN_SCORE = 1.0
+
+# Bump when the shape of analyse_resume()'s result changes
+ANALYSIS_SCHEMA = 3
+
+
+def analysis_version():
+    # Changes whenever anything that feeds a cached result changes
+    inputs = [ANALYSIS_SCHEMA, SKILL_WEIGHT, FIELD_MIN_SCORE, CLASSIFIER_MIN_SCORE, default_scorer.rules,
+              default_scorer.pattern.pattern, [[f['name'], f['keywords'], f['skills'], f['courses']] for f in FIELDS]]
+    return hashlib.sha256(json.dumps(inputs, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+ANALYSIS_VERSION = analysis_version()
+
+
+@lru_cache(maxsize=None)
+def field_matcher():
+    # Compiled once per process from the taxonomy in Taxonomy.py
+    matcher = KeywordMatcher()
+    for idx, field in enumerate(FIELDS):
+        for keyword in field['keywords']:
+            keyword, weight = keyword if isinstance(keyword, tuple) else (keyword, 1.0)
+            matcher.add(keyword, (idx, keyword, weight))
+    return matcher.build()
+
+
+def field_courses(field_name):
+    for field in FIELDS:
+        if field['name'] == field_name:
+            return field['courses']
+    return []
+
+
+def field_skills(field_name):
+    for field in FIELDS:
+        if field['name'] == field_name:
+            return field['skills']
+    return []
+
+
+def candidate_level(pages):
+    if pages == 1:
+        return "Fresher"
+    elif pages == 2:
+        return "Intermediate"
+    elif pages >= 3:
+        return "Experienced"
+    return ''
+
+
+def _keyword_hits(text):
+    # Each distinct (field, keyword) counts once, however often it is repeated
+    return {value for _, _, value in field_matcher().find_all(text)}
+
+
+def score_fields(resume_text, skills=None):
+    scores = {field['name']: 0.0 for field in FIELDS}
+    for idx, _, weight in _keyword_hits(resume_text):
+        scores[FIELDS[idx]['name']] += weight
+    # Skills are joined with a separator so keywords cannot span two skills
+    for idx, _, weight in _keyword_hits(' | '.join(skills or [])):
+        scores[FIELDS[idx]['name']] += weight * SKILL_WEIGHT
+    return scores
+
+
+def recommend_field(resume_text, skills=None):
+    # Highest score wins; ties go to the field listed first in the taxonomy
+    scores = score_fields(resume_text, skills)
+    best = max(range(len(FIELDS)), key=lambda idx: (scores[FIELDS[idx]['name']], -idx))
+    if scores[FIELDS[best]['name']] < FIELD_MIN_SCORE:
+        return '', [], scores
+    return FIELDS[best]['name'], FIELDS[best]['skills'], scores
+
+
+def analyse_resume(path, digest=None, workers=None, on_stage=None, trace=None, duplicates=None):
+    # on_stage(stage) is called as each stage starts, for progress reporting;
+    # trace (a Metrics.RequestTrace) times the stages; duplicates (a
+    # Dedup.DuplicateIndex) marks near-copies of earlier uploads with
+    # duplicate_of. They are still analysed in full: a near-copy can be an
+    # edited resume, or someone else's resume on the same template.
+    def stage(name):
+        if trace is not None:
+            trace.stage(name)
+        if on_stage is not None:
+            on_stage(name)
+
+    stage('extract')
+    extracted = extract_pdf(path, workers=workers)
+    if trace is not None:
+        trace.fields['pages'] = extracted['page_count']
+    signature = match = None
+    if duplicates is not None:
+        stage('dedup')
+        signature = minhash(extracted['text'])
+        if signature is not None:
+            match = duplicates.lookup(signature)
+    stage('nlp')
+    resume_data = parse_resume(extracted)
+    resume_text = extracted['text']
+    pages = resume_data.get('no_of_pages') or 1
+    stage('match')
+    reco_field, recommended_skills, field_scores = recommend_field(resume_text, resume_data.get('skills'))
+    field_source, field_ranking = 'keywords', []
+    if not reco_field:
+        # No exact keyword hit: rank fields on the whole text instead
+        field_ranking = classify_text(resume_text)
+        reco_field = best_field(field_ranking)
+        recommended_skills = field_skills(reco_field)
+        field_source = 'text' if reco_field else ''
+    stage('score')
+    resume_score, sections, section_positions = score_resume(resume_text)
+    analysis = {
+        'digest': digest,
+        'resume_data': resume_data,
+        'resume_text': resume_text,
+        'pages': pages,
+        'cand_level': candidate_level(pages),
+        'reco_field': reco_field,
+        'recommended_skills': recommended_skills,
+        'field_scores': field_scores,
+        'field_source': field_source,
+        'field_ranking': field_ranking,
+        'resume_score': resume_score,
+        'sections': sections,
+        'section_positions': section_positions,
+        'signature': signature,
+    }
+    if match is not None:
+        # Shown to the user, and keeps the near-copy out of the analyses table
+        analysis.update(duplicate_of=match['digest'], similarity=match['similarity'])
+    return analysis
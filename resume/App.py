@@ -1,75 +1,84 @@
 import streamlit as st
 import pandas as pd
-import base64
 import random
-import time
-import datetime
 import os
 import json
-import pymysql
-from pyresparser import ResumeParser
-from pdfminer3.layout import LAParams
-from pdfminer3.pdfpage import PDFPage
-from pdfminer3.pdfinterp import PDFResourceManager, PDFPageInterpreter
-from pdfminer3.converter import TextConverter
-import io
+import time
 from streamlit_tags import st_tags
 from PIL import Image
 import plotly.express as px
-import nltk
-import spacy
-from yt_dlp import YoutubeDL
-
-# Download required NLP packages once
-nltk.download('stopwords')
-nltk.download('punkt')
-nltk.download('averaged_perceptron_tagger')
-nltk.download('wordnet')
-nltk.download('maxent_ne_chunker')
-nltk.download('words')
-spacy.cli.download("en_core_web_sm")
 
 # Import your course lists (make sure Courses.py exists and is correct)
-from Courses import ds_course, web_course, android_course, ios_course, uiux_course, resume_videos, interview_videos
+from Courses import resume_videos, interview_videos
+from Cache import AnalysisCache
+from Analyzer import ANALYSIS_VERSION, FIELDS, STAGES, field_courses
+from Models import startup_report
+from Database import get_database
+from Admin import ADMIN_PAGE_SIZE, aggregate_cache, fetch_page, fetch_rows
+from Export import export_formats, export_table, remove_export
+from Videos import get_catalog, video_title
+from Metrics import prometheus_text, registry as metrics
+from Jobs import DEFAULT_COURSE_COUNT, JobQueue, JobQueueFull
+from Preview import preview_plan
+from Search import get_skill_index
+from Storage import UploadStoreFull, UploadTooLarge, get_upload_store
+
+# st_tags widget keys for each field's recommended skills
+FIELD_TAG_KEYS = {field['name']: str(idx + 2) for idx, field in enumerate(FIELDS)}
+
+STAGE_LABELS = {
+    'queued': 'Waiting for a free analyser...',
+    'save': 'Uploading your Resume...',
+    'extract': 'Reading your Resume...',
+    'dedup': 'Checking for earlier uploads...',
+    'nlp': 'Extracting your details...',
+    'match': 'Matching your skills...',
+    'score': 'Scoring your Resume...',
+    'persist': 'Saving your results...',
+}
+
+SECTION_TIPS = {
+    'Objective': 'Please add your career objective for better recruiter understanding.',
+    'Declaration': 'Please add Declaration for authenticity assurance.',
+    'Hobbies/Interests': 'Please add Hobbies/Interests to showcase your personality.',
+    'Achievements': 'Please add Achievements to show your capabilities.',
+    'Projects': 'Please add Projects to demonstrate your experience.',
+}
 
 # --- Helper Functions ---
 
-def fetch_yt_video_title(link):
-    ydl_opts = {'quiet': True}
-    with YoutubeDL(ydl_opts) as ydl:
-        info_dict = ydl.extract_info(link, download=False)
-        return info_dict.get('title', None)
-
-def get_table_download_link(df, filename, text):
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">{text}</a>'
-    return href
-
-def pdf_reader(file):
-    resource_manager = PDFResourceManager()
-    fake_file_handle = io.StringIO()
-    converter = TextConverter(resource_manager, fake_file_handle, laparams=LAParams())
-    page_interpreter = PDFPageInterpreter(resource_manager, converter)
-    with open(file, 'rb') as fh:
-        for page in PDFPage.get_pages(fh, caching=True, check_extractable=True):
-            page_interpreter.process_page(page)
-        text = fake_file_handle.getvalue()
-    converter.close()
-    fake_file_handle.close()
-    return text
-
-def show_pdf(file_path):
-    with open(file_path, "rb") as f:
-        base64_pdf = base64.b64encode(f.read()).decode('utf-8')
-    pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
-    st.markdown(pdf_display, unsafe_allow_html=True)
+@st.cache_resource
+def get_analysis_cache():
+    # One cache per server process, shared across sessions and reruns
+    return AnalysisCache(version=ANALYSIS_VERSION)
+
+@st.cache_resource
+def check_models():
+    # NLP models are verified once per process; loading happens on first analysis
+    return startup_report()
+
+@st.cache_resource
+def get_job_queue():
+    # One bounded worker pool per server process, shared by all sessions
+    return JobQueue(cache=get_analysis_cache())
+
+def show_pdf(file_path, digest):
+    # Cached thumbnails or a URL where possible; inline base64 only for small files
+    mode, payload = preview_plan(file_path, digest)
+    if mode == 'thumbnails':
+        st.image(payload, width=700)
+    elif mode in ('url', 'inline'):
+        src = payload if mode == 'url' else f"data:application/pdf;base64,{payload}"
+        pdf_display = f'<iframe src="{src}" width="700" height="1000" type="application/pdf"></iframe>'
+        st.markdown(pdf_display, unsafe_allow_html=True)
+    else:
+        st.info(f"Preview not available for large files ({payload // 1024} KB).")
 
 def course_recommender(course_list):
     st.subheader("**Courses & Certificates Recommendations 🎓**")
     rec_course = []
-    no_of_reco = st.slider('Choose Number of Course Recommendations:', 1, 10, 5)
-    random.shuffle(course_list)
+    # course_list arrives already shuffled by the analysis job
+    no_of_reco = st.slider('Choose Number of Course Recommendations:', 1, 10, DEFAULT_COURSE_COUNT)
     for idx, (c_name, c_link) in enumerate(course_list):
         if idx == no_of_reco:
             break
@@ -77,44 +86,8 @@ def course_recommender(course_list):
         rec_course.append(c_name)
     return rec_course
 
-# --- Database Connection ---
-
-connection = pymysql.connect(host='localhost', user='root', password='@Maruti800', db='cv')
-cursor = connection.cursor()
-
-def insert_data(name, email, res_score, timestamp, no_of_pages, reco_field, cand_level, skills, recommended_skills, courses):
-    DB_table_name = 'user_data'
-    insert_sql = f"""INSERT INTO {DB_table_name} 
-                     (Name, Email_ID, resume_score, Timestamp, Page_no, Predicted_Field, User_level, Actual_skills, Recommended_skills, Recommended_courses)
-                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-    # Convert lists to JSON strings before inserting
-    rec_values = (
-        name,
-        email,
-        str(res_score),
-        timestamp,
-        str(no_of_pages),
-        reco_field,
-        cand_level,
-        json.dumps(skills),
-        json.dumps(recommended_skills),
-        json.dumps(courses),
-    )
-    cursor.execute(insert_sql, rec_values)
-    connection.commit()
-
 # --- Data Decoding Helpers for Admin ---
 
-def decode_text_column(col):
-    def safe_decode(x):
-        if isinstance(x, bytes):
-            try:
-                return x.decode('utf-8')
-            except:
-                return x
-        return x
-    return col.apply(safe_decode)
-
 def decode_json_column(col):
     def safe_parse(x):
         if isinstance(x, bytes):
@@ -127,6 +100,9 @@ def decode_json_column(col):
 
 # --- Streamlit App ---
 
+# Video titles come from the offline catalog built by `python Videos.py --refresh`
+get_catalog()
+
 st.set_page_config(
     page_title="AI Resume Analyzer",
     page_icon='./Logo/logo2.png',
@@ -185,221 +161,168 @@ def run():
     link = '[©Developed by Rahul Gupta](https://www.linkedin.com/in/rahul-gupta-29oct/)'
     st.sidebar.markdown(link, unsafe_allow_html=True)
 
-    # Create DB and Table if not exist
-    cursor.execute("CREATE DATABASE IF NOT EXISTS CV;")
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS user_data (
-            ID INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
-            Name VARCHAR(500) NOT NULL,
-            Email_ID VARCHAR(500) NOT NULL,
-            resume_score VARCHAR(8) NOT NULL,
-            Timestamp VARCHAR(50) NOT NULL,
-            Page_no VARCHAR(5) NOT NULL,
-            Predicted_Field VARCHAR(100) NOT NULL,
-            User_level VARCHAR(100) NOT NULL,
-            Actual_skills TEXT NOT NULL,
-            Recommended_skills TEXT NOT NULL,
-            Recommended_courses TEXT NOT NULL
-        );
-        """
-    )
+    # Create DB and Table if not exist (once per process)
+    database = get_database()
+    database.ensure_schema()
 
     if choice == 'User':
         st.markdown(
             '''<h5 style='text-align: left; color: #021659;'>Upload your resume, and get smart recommendations</h5>''',
             unsafe_allow_html=True,
         )
+        model_report = check_models()
+        if model_report['missing']:
+            st.error("Resume analysis is unavailable, missing NLP models: " + ', '.join(model_report['missing']))
+            st.stop()
         pdf_file = st.file_uploader("Choose your Resume", type=["pdf"])
         if pdf_file is not None:
-            with st.spinner('Uploading your Resume...'):
-                time.sleep(3)
-            save_path = './Uploaded_Resumes/' + pdf_file.name
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            with open(save_path, "wb") as f:
-                f.write(pdf_file.getbuffer())
-            show_pdf(save_path)
-
-            # Extract resume data using pyresparser
-            resume_data = ResumeParser(save_path).get_extracted_data()
+            # Progress follows the real pipeline stages
+            pipeline_bar = st.progress(0, text=STAGE_LABELS['save'])
+
+            def on_stage(stage):
+                position = STAGES.index(stage) if stage in STAGES else 0
+                pipeline_bar.progress(position / len(STAGES), text=STAGE_LABELS.get(stage, stage))
+
+            # The analysis job keeps the one trace per upload; the page only times
+            # the save (handed to the job) and its own rendering
+            save_started = time.perf_counter()
+            on_stage('save')
+            # Stored under its content hash, streamed in chunks; identical files are kept once.
+            # Reruns of the same upload reuse the stored copy instead of writing it again.
+            upload_key = f'stored_upload_{pdf_file.file_id}'
+            stored = st.session_state.get(upload_key)
+            if stored is not None and not os.path.exists(stored.path):
+                stored = None
+            try:
+                if stored is None:
+                    stored = get_upload_store().save(pdf_file, size_hint=pdf_file.size)
+                    st.session_state[upload_key] = stored
+            except UploadTooLarge:
+                pipeline_bar.empty()
+                metrics.observe('save', time.perf_counter() - save_started, 'too_large', pdf_file.size)
+                st.error('This file is too large. Please upload a smaller resume.')
+                st.stop()
+            except UploadStoreFull:
+                pipeline_bar.empty()
+                metrics.observe('save', time.perf_counter() - save_started, 'rejected', pdf_file.size)
+                st.warning('The analyser is busy right now. Please try again in a minute.')
+                st.stop()
+            save_path, digest = stored.path, stored.digest
+            save_stage = {'stage': 'save', 'seconds': round(time.perf_counter() - save_started, 6),
+                          'outcome': 'ok', 'bytes': pdf_file.size, 'pages': 0}
+
+            # Analysis runs as a job on the worker pool; one job per file per session
+            jobs = get_job_queue()
+            job_key = f'analysis_job_{digest}'
+            job = jobs.get(st.session_state.get(job_key))
+            if job is None:
+                try:
+                    job = jobs.submit(save_path, digest, size_bytes=pdf_file.size, stages=[save_stage],
+                                      file_name=pdf_file.name)
+                except JobQueueFull:
+                    pipeline_bar.empty()
+                    metrics.observe('job', 0.0, 'rejected', pdf_file.size)
+                    st.warning('The analyser is busy right now. Please try again in a minute.')
+                    st.stop()
+                st.session_state[job_key] = job.id
+            while not job.wait(0.25):
+                on_stage(job.stage)
+            if job.status == 'failed':
+                pipeline_bar.empty()
+                # The next rerun submits a fresh job instead of showing this failure again
+                st.session_state.pop(job_key, None)
+                st.error('Failed to analyse this resume. Please try another resume.')
+                st.stop()
+            analysis = job.result
+            render_started = time.perf_counter()
+            show_pdf(save_path, digest)
+            resume_data = analysis['resume_data']
             if resume_data:
-                resume_text = pdf_reader(save_path)
-
                 st.header("**Resume Analysis**")
-                st.success("Hello " + resume_data.get('name', 'Candidate'))
+                st.success("Hello " + (resume_data.get('name') or 'Candidate'))
+                if analysis.get('duplicate_of'):
+                    st.info(f"This resume is {analysis['similarity']:.0%} identical to one analysed before, "
+                            "so it was not added again.")
 
                 st.subheader("**Your Basic Info**")
                 try:
-                    st.text('Name: ' + resume_data.get('name', 'N/A'))
-                    st.text('Email: ' + resume_data.get('email', 'N/A'))
-                    st.text('Contact: ' + resume_data.get('mobile_number', 'N/A'))
+                    st.text('Name: ' + (resume_data.get('name') or 'N/A'))
+                    st.text('Email: ' + (resume_data.get('email') or 'N/A'))
+                    st.text('Contact: ' + (resume_data.get('mobile_number') or 'N/A'))
                     st.text('Resume pages: ' + str(resume_data.get('no_of_pages', 'N/A')))
                 except Exception:
                     pass
 
-                cand_level = ''
-                pages = resume_data.get('no_of_pages', 1)
-                if pages == 1:
-                    cand_level = "Fresher"
+                cand_level = analysis['cand_level']
+                if cand_level == "Fresher":
                     st.markdown('''<h4 style='color: #d73b5c;'>You are at Fresher level!</h4>''', unsafe_allow_html=True)
-                elif pages == 2:
-                    cand_level = "Intermediate"
+                elif cand_level == "Intermediate":
                     st.markdown('''<h4 style='color: #1ed760;'>You are at Intermediate level!</h4>''', unsafe_allow_html=True)
-                elif pages >= 3:
-                    cand_level = "Experienced"
+                elif cand_level == "Experienced":
                     st.markdown('''<h4 style='color: #fba171;'>You are at Experienced level!</h4>''', unsafe_allow_html=True)
 
                 # Skills recommendations based on keywords
                 keywords = st_tags(
                     label='### Your Current Skills',
                     text='See our skills recommendation below',
-                    value=resume_data.get('skills', []),
+                    value=resume_data.get('skills') or [],
                     key='1',
                 )
 
-                ds_keywords = [
-                    'tensorflow', 'keras', 'pytorch', 'machine learning', 'deep learning', 'flask', 'streamlit'
-                ]
-                web_keywords = [
-                    'react', 'django', 'node js', 'react js', 'php', 'laravel', 'magento', 'wordpress',
-                    'javascript', 'angular js', 'c#', 'flask'
-                ]
-                android_keywords = ['android', 'android development', 'flutter', 'kotlin', 'xml', 'kivy']
-                ios_keywords = ['ios', 'ios development', 'swift', 'cocoa', 'cocoa touch', 'xcode']
-                uiux_keywords = [
-                    'ux', 'adobe xd', 'figma', 'zeplin', 'balsamiq', 'ui', 'prototyping', 'wireframes', 'storyframes',
-                    'adobe photoshop', 'photoshop', 'editing', 'adobe illustrator', 'illustrator', 'adobe after effects',
-                    'after effects', 'adobe premier pro', 'premier pro', 'adobe indesign', 'indesign', 'wireframe', 'solid',
-                    'grasp', 'user research', 'user experience'
-                ]
-
-                recommended_skills = []
-                reco_field = ''
-                rec_course = []
-
-                skills_lower = [skill.lower() for skill in resume_data.get('skills', [])]
-
-                # Recommend courses & skills based on skill keywords
-                def recommend(field_keywords, field_name, rec_skills, course_list, key):
-                    nonlocal reco_field, recommended_skills, rec_course
-                    if any(kw in skills_lower for kw in field_keywords):
-                        reco_field = field_name
-                        st.success(f"** Our analysis says you are looking for {field_name} Jobs.**")
-                        recommended_skills = rec_skills
-                        st_tags(label='### Recommended skills for you.',
-                                text='Recommended skills generated from System',
-                                value=recommended_skills,
-                                key=key)
-                        st.markdown(
-                            '''<h4 style='color: #1ed760;'>Adding these skills to resume will boost 🚀 the chances of getting a Job 💼</h4>''',
-                            unsafe_allow_html=True)
-                        rec_course = course_recommender(course_list)
-                        return True
-                    return False
-
-                if not recommend(ds_keywords, 'Data Science',
-                                 ['Data Visualization', 'Predictive Analysis', 'Statistical Modeling', 'Data Mining',
-                                  'Clustering & Classification', 'Data Analytics', 'Quantitative Analysis', 'Web Scraping',
-                                  'ML Algorithms', 'Keras', 'Pytorch', 'Probability', 'Scikit-learn', 'Tensorflow',
-                                  'Flask', 'Streamlit'],
-                                 ds_course, '2'):
-                    if not recommend(web_keywords, 'Web Development',
-                                     ['React', 'Django', 'Node JS', 'React JS', 'PHP', 'Laravel', 'Magento', 'WordPress',
-                                      'JavaScript', 'Angular JS', 'C#', 'Flask', 'SDK'],
-                                     web_course, '3'):
-                        if not recommend(android_keywords, 'Android Development',
-                                         ['Android', 'Android Development', 'Flutter', 'Kotlin', 'XML', 'Java', 'Kivy', 'GIT',
-                                          'SDK', 'SQLite'],
-                                         android_course, '4'):
-                            if not recommend(ios_keywords, 'IOS Development',
-                                             ['IOS', 'IOS Development', 'Swift', 'Cocoa', 'Cocoa Touch', 'Xcode',
-                                              'Objective-C', 'SQLite', 'Plist', 'StoreKit', 'UI-Kit', 'AV Foundation',
-                                              'Auto-Layout'],
-                                             ios_course, '5'):
-                                if not recommend(uiux_keywords, 'UI-UX Development',
-                                                 ['UI', 'User Experience', 'Adobe XD', 'Figma', 'Zeplin', 'Balsamiq',
-                                                  'Prototyping', 'Wireframes', 'Storyframes', 'Adobe Photoshop',
-                                                  'Editing', 'Illustrator', 'After Effects', 'Premier Pro', 'Indesign',
-                                                  'Wireframe', 'Solid', 'Grasp', 'User Research'],
-                                                 uiux_course, '6'):
-                                    st.info("No matching skill category found for recommendations.")
-
-                # Timestamp for DB entry
-                ts = time.time()
-                cur_date = datetime.datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
-                cur_time = datetime.datetime.fromtimestamp(ts).strftime('%H:%M:%S')
-                timestamp = f"{cur_date}_{cur_time}"
+                # Recommend courses & skills based on the predicted field
+                reco_field = analysis['reco_field']
+                recommended_skills = analysis['recommended_skills']
+                if reco_field:
+                    st.success(f"** Our analysis says you are looking for {reco_field} Jobs.**")
+                    if analysis.get('field_source') == 'text':
+                        st.caption(f"No listed skill matched a field exactly, so this was predicted from the "
+                                   f"overall resume text ({analysis['field_ranking'][0]['confidence']:.0%} confidence).")
+                    st_tags(label='### Recommended skills for you.',
+                            text='Recommended skills generated from System',
+                            value=recommended_skills,
+                            key=FIELD_TAG_KEYS.get(reco_field, '2'))
+                    st.markdown(
+                        '''<h4 style='color: #1ed760;'>Adding these skills to resume will boost 🚀 the chances of getting a Job 💼</h4>''',
+                        unsafe_allow_html=True)
+                    course_recommender(analysis.get('course_order') or list(field_courses(reco_field)))
+                else:
+                    st.info("No matching skill category found for recommendations.")
 
                 # Resume writing tips & scoring
                 st.subheader("**Resume Tips & Ideas 💡**")
-                resume_score = 0
-
-                if 'Objective' in resume_text:
-                    resume_score += 20
-                    st.markdown('''<h5 style='color: #1ed760;'>[+] Awesome! You have added Objective</h5>''', unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5>Please add your career objective for better recruiter understanding.</h5>''', unsafe_allow_html=True)
-
-                if 'Declaration' in resume_text:
-                    resume_score += 20
-                    st.markdown('''<h5 style='color: #1ed760;'>[+] Awesome! You have added Declaration</h5>''', unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5>Please add Declaration for authenticity assurance.</h5>''', unsafe_allow_html=True)
-
-                if ('Hobbies' in resume_text) or ('Interests' in resume_text):
-                    resume_score += 20
-                    st.markdown('''<h5 style='color: #1ed760;'>[+] Awesome! You have added Hobbies/Interests</h5>''', unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5>Please add Hobbies/Interests to showcase your personality.</h5>''', unsafe_allow_html=True)
-
-                if 'Achievements' in resume_text:
-                    resume_score += 20
-                    st.markdown('''<h5 style='color: #1ed760;'>[+] Awesome! You have added Achievements</h5>''', unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5>Please add Achievements to show your capabilities.</h5>''', unsafe_allow_html=True)
-
-                if 'Projects' in resume_text:
-                    resume_score += 20
-                    st.markdown('''<h5 style='color: #1ed760;'>[+] Awesome! You have added Projects</h5>''', unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5>Please add Projects to demonstrate your experience.</h5>''', unsafe_allow_html=True)
+                resume_score = analysis['resume_score']
+                for section, found in analysis['sections'].items():
+                    if found:
+                        st.markdown(f'''<h5 style='color: #1ed760;'>[+] Awesome! You have added {section}</h5>''', unsafe_allow_html=True)
+                    else:
+                        st.markdown(f'''<h5>{SECTION_TIPS.get(section, f"Please add {section}.")}</h5>''', unsafe_allow_html=True)
 
                 # Show Resume Score progress bar
                 st.subheader("**Resume Score 📝**")
-                my_bar = st.progress(0)
-                for percent_complete in range(resume_score):
-                    time.sleep(0.05)
-                    my_bar.progress(percent_complete + 1)
+                st.progress(min(resume_score, 100))
                 st.success(f"** Your Resume Writing Score: {resume_score} **")
                 st.warning("** Note: This score is based on content present in your Resume. **")
                 st.balloons()
 
-                # Insert user data into database
-                insert_data(
-                    resume_data.get('name', ''),
-                    resume_data.get('email', ''),
-                    resume_score,
-                    timestamp,
-                    pages,
-                    reco_field,
-                    cand_level,
-                    resume_data.get('skills', []),
-                    recommended_skills,
-                    rec_course,
-                )
+                # The job has already queued the analyses row
+                pipeline_bar.progress(1.0, text='Analysis complete')
+
+                metrics.observe('render', time.perf_counter() - render_started, 'ok', pdf_file.size)
 
                 # Bonus videos for resume writing and interview tips
                 st.header("**Bonus Video for Resume Writing Tips 💡**")
                 resume_vid = random.choice(resume_videos)
-                st.subheader("✅ **" + fetch_yt_video_title(resume_vid) + "**")
+                st.subheader("✅ **" + video_title(resume_vid, "Resume Writing Tips") + "**")
                 st.video(resume_vid)
 
                 st.header("**Bonus Video for Interview Tips 💡**")
                 interview_vid = random.choice(interview_videos)
-                st.subheader("✅ **" + fetch_yt_video_title(interview_vid) + "**")
+                st.subheader("✅ **" + video_title(interview_vid, "Interview Tips") + "**")
                 st.video(interview_vid)
 
             else:
+                pipeline_bar.empty()
+                metrics.observe('render', time.perf_counter() - render_started, 'no_data', pdf_file.size)
                 st.error('Failed to extract resume data. Please try another resume.')
 
     else:
@@ -407,54 +330,89 @@ def run():
         st.success('Welcome to Admin Side')
         ad_user = st.text_input("Username")
         ad_password = st.text_input("Password", type='password')
-        query = "SELECT * FROM user_data"
-
-        # Establish MySQL connection for admin separately to avoid conflicts
-        connection_admin = pymysql.connect(host='localhost', user='root', password='@Maruti800', db='cv')
-        cursor_admin = connection_admin.cursor()
 
+        # Remember the login so pagination buttons don't log the admin out
         if st.button('Login'):
-            if ad_user == 'rahul' and ad_password == 'rahulgupta':
-                # Fetch data into pandas DataFrame
-                plot_data = pd.read_sql(query, connection_admin)
-
-                # Decode columns with text or JSON
-                plot_data['Predicted_Field'] = decode_text_column(plot_data['Predicted_Field'])
-                plot_data['User_level'] = decode_text_column(plot_data['User_level'])
-
-                plot_data['Actual_skills'] = decode_json_column(plot_data['Actual_skills'])
-                plot_data['Recommended_skills'] = decode_json_column(plot_data['Recommended_skills'])
-                plot_data['Recommended_courses'] = decode_json_column(plot_data['Recommended_courses'])
-
-                # Pie Chart: Predicted Field
-                counts = plot_data['Predicted_Field'].value_counts().reset_index()
-                counts.columns = ['Predicted_Field', 'Count']
-                st.subheader("**Pie Chart for Predicted Field Recommendation**")
-                fig = px.pie(counts, values='Count', names='Predicted_Field', title='Predicted Field according to the Skills')
-                st.plotly_chart(fig)
-
-                # Pie Chart: User Level
-                counts_level = plot_data['User_level'].value_counts().reset_index()
-                counts_level.columns = ['User_level', 'Count']
-                st.subheader("**Pie Chart for User's Experienced Level**")
-                fig_level = px.pie(counts_level, values='Count', names='User_level', title="User's Experienced Level")
-                st.plotly_chart(fig_level)
-
-                # Display Data Table
-                st.subheader("**User Data Table**")
-
-                # Convert list columns to comma-separated string for display
-                plot_data['Actual_skills'] = plot_data['Actual_skills'].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
-                plot_data['Recommended_skills'] = plot_data['Recommended_skills'].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
-                plot_data['Recommended_courses'] = plot_data['Recommended_courses'].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
-
-                st.dataframe(plot_data)
-
-                # Download link for CSV export
-                st.markdown(get_table_download_link(plot_data, "user_data.csv", "Download data as CSV"), unsafe_allow_html=True)
-
-            else:
+            st.session_state['admin_logged_in'] = ad_user == 'rahul' and ad_password == 'rahulgupta'
+            st.session_state['admin_page_starts'] = [0]
+            if not st.session_state['admin_logged_in']:
                 st.error('Incorrect username or password!')
 
+        if st.session_state.get('admin_logged_in'):
+            # Pie Chart: Predicted Field (aggregated in the database, cached until new rows arrive)
+            counts = pd.DataFrame(aggregate_cache.counts(database, 'Predicted_Field'), columns=['Predicted_Field', 'Count'])
+            st.subheader("**Pie Chart for Predicted Field Recommendation**")
+            fig = px.pie(counts, values='Count', names='Predicted_Field', title='Predicted Field according to the Skills')
+            st.plotly_chart(fig)
+
+            # Pie Chart: User Level
+            counts_level = pd.DataFrame(aggregate_cache.counts(database, 'User_level'), columns=['User_level', 'Count'])
+            st.subheader("**Pie Chart for User's Experienced Level**")
+            fig_level = px.pie(counts_level, values='Count', names='User_level', title="User's Experienced Level")
+            st.plotly_chart(fig_level)
+
+            # Display Data Table, one page at a time
+            st.subheader("**User Data Table**")
+            page_starts = st.session_state.setdefault('admin_page_starts', [0])
+            columns, rows = fetch_page(database, after_id=page_starts[-1], limit=ADMIN_PAGE_SIZE)
+            plot_data = pd.DataFrame(rows, columns=columns)
+
+            # Convert JSON list columns to comma-separated string for display
+            for column in ('Actual_skills', 'Recommended_skills', 'Recommended_courses'):
+                plot_data[column] = decode_json_column(plot_data[column]).apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
+
+            st.dataframe(plot_data)
+
+            prev_col, next_col = st.columns(2)
+            if prev_col.button('Previous page', disabled=len(page_starts) == 1):
+                page_starts.pop()
+                st.rerun()
+            if next_col.button('Next page', disabled=len(rows) < ADMIN_PAGE_SIZE):
+                page_starts.append(rows[-1][columns.index('ID')])
+                st.rerun()
+
+            # Candidate search on the in-memory skill index
+            st.subheader("**Candidate Search**")
+            skill_index = get_skill_index()
+            skill_index.refresh()
+            skill_options = skill_index.vocabulary()
+            must_have = st.multiselect("Has all of these skills", skill_options)
+            any_of = st.multiselect("And at least one of these skills", skill_options)
+            overview = skill_index.search(limit=0)['facets']
+            field_col, level_col = st.columns(2)
+            search_field = field_col.selectbox("Predicted field", ['Any'] + [v for v, _ in overview['Predicted_Field']])
+            search_level = level_col.selectbox("Experience level", ['Any'] + [v for v, _ in overview['User_level']])
+            if must_have or any_of or search_field != 'Any' or search_level != 'Any':
+                found = skill_index.search(must_have, any_of,
+                                           field=None if search_field == 'Any' else search_field,
+                                           level=None if search_level == 'Any' else search_level,
+                                           limit=ADMIN_PAGE_SIZE)
+                st.write(f"**{found['total']}** matching candidates"
+                         + (f" (showing the newest {ADMIN_PAGE_SIZE})" if found['total'] > ADMIN_PAGE_SIZE else ''))
+                facet_fields, facet_levels = st.columns(2)
+                facet_fields.dataframe(pd.DataFrame(found['facets']['Predicted_Field'], columns=['Predicted_Field', 'Count']))
+                facet_levels.dataframe(pd.DataFrame(found['facets']['User_level'], columns=['User_level', 'Count']))
+                columns, rows = fetch_rows(database, found['ids'])
+                search_data = pd.DataFrame(rows, columns=columns)
+                for column in ('Actual_skills', 'Recommended_skills', 'Recommended_courses'):
+                    search_data[column] = decode_json_column(search_data[column]).apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
+                st.dataframe(search_data)
+
+            # Per-stage timings for this server process
+            with st.expander("Analysis metrics"):
+                st.code(prometheus_text(), language='text')
+
+            # Full export, streamed to a file only when asked for
+            export_fmt = st.selectbox("Export format", export_formats())
+            if st.button('Prepare export'):
+                # Only the latest export is kept, and it is offered once, right after it is made
+                remove_export(st.session_state.pop('admin_export', None))
+                with st.spinner('Exporting user data...'):
+                    export_path = export_table(database, fmt=export_fmt)
+                st.session_state['admin_export'] = export_path
+                with open(export_path, 'rb') as f:
+                    st.download_button("Download data as " + os.path.splitext(export_path)[1][1:].upper(), f,
+                                       file_name=os.path.basename(export_path))
+
 if __name__ == "__main__":
     run()
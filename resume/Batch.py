@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from Cache import file_digest
+
+# --- Headless batch analysis ---
+# Usage: python Batch.py ./Uploaded_Resumes -o results.jsonl --workers 8
+# Results are streamed one JSON object per line; rerunning with the same output
+# file skips resumes that already have a successful result.
+
+
+def find_pdfs(directory):
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.lower().endswith('.pdf'):
+                yield os.path.join(root, name)
+
+
+def load_completed(output_path):
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash can leave a partially written last line
+                continue
+            if 'error' not in record:
+                completed.add(record.get('digest'))
+    return completed
+
+
+def drop_partial_line(output_path):
+    # Cuts a crash-truncated last line so appended records start on a fresh line
+    try:
+        with open(output_path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            pos = end
+            while pos > 0:
+                step = min(4096, pos)
+                f.seek(pos - step)
+                chunk = f.read(step)
+                newline = chunk.rfind(b'\n')
+                if newline != -1:
+                    pos = pos - step + newline + 1
+                    break
+                pos -= step
+            if pos != end:
+                f.truncate(pos)
+    except FileNotFoundError:
+        pass
+
+
+def analyse_path(path, include_text=False):
+    # Imported here so the parent process does not load spaCy
+    from Analyzer import analyse_resume
+    from Metrics import RequestTrace
+    record = {'path': path}
+    trace = RequestTrace(file_name=path)
+    try:
+        trace.stage('read')
+        with open(path, 'rb') as f:
+            data = f.read()
+        record['digest'] = file_digest(data)
+        trace.fields.update(bytes=len(data), digest=record['digest'])
+        # Page layout stays in this process; the pool already spreads the work
+        analysis = analyse_resume(path, digest=record['digest'], workers=1, trace=trace)
+        if not include_text:
+            analysis.pop('resume_text', None)
+        record.update(analysis)
+        trace.finish()
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+        trace.finish('error')
+    return record
+
+
+def run_batch(directory, output_path, workers=None, include_text=False, resume=True):
+    completed = load_completed(output_path) if resume else set()
+    pending = []
+    skipped = 0
+    for path in find_pdfs(directory):
+        if completed:
+            with open(path, 'rb') as f:
+                if file_digest(f.read()) in completed:
+                    skipped += 1
+                    continue
+        pending.append(path)
+
+    done = failed = 0
+    mode = 'a' if resume else 'w'
+    if resume:
+        drop_partial_line(output_path)
+    workers = workers or os.cpu_count() or 1
+    with open(output_path, mode, encoding='utf-8') as out, ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep a bounded number of tasks in flight rather than queueing every file
+        paths = iter(pending)
+        in_flight = set()
+        while True:
+            while len(in_flight) < workers * 2:
+                path = next(paths, None)
+                if path is None:
+                    break
+                in_flight.add(pool.submit(analyse_path, path, include_text))
+            if not in_flight:
+                break
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                record = future.result()
+                out.write(json.dumps(record, default=str) + '\n')
+                out.flush()
+                if 'error' in record:
+                    failed += 1
+                else:
+                    done += 1
+    return {'skipped': skipped, 'analysed': done, 'failed': failed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Analyse a directory of resumes without the Streamlit UI.')
+    parser.add_argument('directory', nargs='?', default='./Uploaded_Resumes')
+    parser.add_argument('-o', '--output', default='results.jsonl', help='JSON Lines output file')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--include-text', action='store_true', help='include the extracted resume text')
+    parser.add_argument('--no-resume', action='store_true', help='overwrite the output instead of resuming')
+    args = parser.parse_args(argv)
+
+    summary = run_batch(args.directory, args.output, workers=args.workers,
+                        include_text=args.include_text, resume=not args.no_resume)
+    print(json.dumps(summary), file=sys.stderr)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,241 @@
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Sections import SECTION_RULES
+from Taxonomy import fields as FIELDS
+
+# --- Reproducible benchmark suite ---
+# Usage: python Benchmark.py --sizes 10,100,1000 -o bench.json [--compare old.json]
+# Synthetic resumes are generated offline from a fixed seed (page counts,
+# section sets and skill mixes drawn from Taxonomy.py / Sections.py) and every
+# benchmark reports throughput, p50/p95 latency per resume and peak memory.
+
+DEFAULT_SIZES = (10, 100, 1000)
+BENCHMARKS = ('extract', 'parse', 'match', 'score', 'db_insert')
+FILLER = ('developed', 'designed', 'implemented', 'maintained', 'improved', 'team', 'system', 'service',
+          'customers', 'performance', 'reports', 'delivered', 'features', 'testing', 'deployment', 'users')
+LINES_PER_PAGE = 50
+
+
+# --- Synthetic corpus ---
+
+def synthetic_resume(rng, idx):
+    pages = rng.choice((1, 1, 2, 2, 3, 4))
+    field = rng.choice(FIELDS)
+    keywords = [k[0] if isinstance(k, tuple) else k for k in field['keywords']]
+    skills = rng.sample(keywords, min(len(keywords), rng.randint(2, 6)))
+    # Occasionally mix in a second field's skills
+    if rng.random() < 0.3:
+        other = rng.choice(FIELDS)
+        skills += [k[0] if isinstance(k, tuple) else k for k in other['keywords']][:2]
+    sections = [rule for rule in SECTION_RULES if rng.random() < 0.6]
+
+    lines = [f'Candidate {idx}', f'candidate{idx}@example.com', f'+91 98{idx % 100000000:08d}', '',
+             'SKILLS', ', '.join(skills), '']
+    for _, headings, _ in sections:
+        lines.append(rng.choice(headings).upper())
+        for _ in range(rng.randint(2, 5)):
+            lines.append(' '.join(rng.choice(FILLER) for _ in range(rng.randint(6, 12))))
+        lines.append('')
+    # Pad with experience text up to the chosen page count
+    target = pages * LINES_PER_PAGE - 5
+    while len(lines) < target:
+        words = [rng.choice(FILLER) for _ in range(rng.randint(6, 12))]
+        if rng.random() < 0.2:
+            words.append(rng.choice(skills))
+        lines.append(' '.join(words))
+    return {'text': '\n'.join(lines), 'pages': pages, 'skills': skills, 'field': field['name']}
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path, text):
+    # Minimal single-font PDF writer, enough for pdfminer to lay out the text
+    lines = text.split('\n')
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for page_lines in pages:
+        stream = 'BT /F1 10 Tf 14 TL 50 800 Td ' + ' '.join(f'({_pdf_escape(l)}) Tj T*' for l in page_lines) + ' ET'
+        objects.append(f'<< /Length {len(stream.encode("latin-1", "replace"))} >>\nstream\n{stream}\nendstream')
+        content_id = len(objects)
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f'{num} 0 obj\n{body}\nendobj\n'.encode('latin-1', 'replace')
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    for offset in offsets:
+        out += f'{offset:010d} 00000 n \n'.encode()
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def build_corpus(size, seed, corpus_dir=None, with_pdfs=True):
+    rng = random.Random(f'{seed}:{size}')
+    docs = [synthetic_resume(rng, idx) for idx in range(size)]
+    if with_pdfs and corpus_dir:
+        os.makedirs(corpus_dir, exist_ok=True)
+        for idx, doc in enumerate(docs):
+            # Named after the text it holds, so a PDF is only reused for the same seed and taxonomy
+            text_hash = hashlib.sha256(doc['text'].encode('utf-8')).hexdigest()[:12]
+            doc['path'] = os.path.join(corpus_dir, f'resume_{seed}_{size}_{idx:06d}_{text_hash}.pdf')
+            if not os.path.exists(doc['path']):
+                write_pdf(doc['path'], doc['text'])
+    return docs
+
+
+# --- Benchmarks (each returns a per-document callable, or raises ImportError) ---
+
+def _bench_extract(docs):
+    from Extractor import extract_pdf
+    # Single-process layout, so per-resume timings compare across machines
+    return lambda doc: extract_pdf(doc['path'], workers=1)
+
+
+def _bench_parse(docs):
+    from Parser import parse_resume
+    return lambda doc: parse_resume({'text': doc['text'], 'page_count': doc['pages']})
+
+
+def _bench_match(docs):
+    from Analyzer import recommend_field
+    return lambda doc: recommend_field(doc['text'], doc['skills'])
+
+
+def _bench_score(docs):
+    from Sections import score_resume
+    return lambda doc: score_resume(doc['text'])
+
+
+def _bench_db_insert(docs):
+    import datetime
+    from Database import Database, analysis_row, write_analyses
+    path = os.path.join(tempfile.mkdtemp(prefix='resume_bench_'), 'bench.db')
+    database = Database(backend='sqlite', sqlite_path=path, pool_size=1)
+    database.ensure_schema()
+    created_at = datetime.datetime(2024, 1, 1)
+
+    def insert(doc):
+        row = analysis_row('Candidate', 'candidate@example.com', 60, created_at, doc['pages'],
+                           doc['field'], 'Fresher', doc['skills'], [], [])
+        write_analyses(database, [row])
+    return insert
+
+
+BENCH_FUNCS = {
+    'extract': _bench_extract,
+    'parse': _bench_parse,
+    'match': _bench_match,
+    'score': _bench_score,
+    'db_insert': _bench_db_insert,
+}
+
+
+def _percentile(sorted_values, q):
+    idx = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[idx]
+
+
+def run_benchmark(name, docs, measure_memory=True):
+    try:
+        func = BENCH_FUNCS[name](docs)
+    except ImportError as e:
+        return {'benchmark': name, 'size': len(docs), 'skipped': f'missing dependency: {e.name or e}'}
+    # Warm up once so model loading and pattern compilation aren't timed
+    func(docs[0])
+    latencies = []
+    start = time.perf_counter()
+    for doc in docs:
+        t0 = time.perf_counter()
+        func(doc)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    result = {
+        'benchmark': name,
+        'size': len(docs),
+        'seconds': round(elapsed, 6),
+        'throughput_per_s': round(len(docs) / elapsed, 3) if elapsed else None,
+        'p50_ms': round(_percentile(latencies, 0.5) * 1000, 3),
+        'p95_ms': round(_percentile(latencies, 0.95) * 1000, 3),
+    }
+    if measure_memory:
+        # A separate pass, so tracemalloc overhead doesn't skew the timings
+        tracemalloc.start()
+        for doc in docs:
+            func(doc)
+        result['peak_memory_kib'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+    return result
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['benchmark'], r['size']): r for r in json.load(f)['results']}
+    for r in results:
+        old = baseline.get((r['benchmark'], r['size']))
+        if not old or 'skipped' in r or 'skipped' in old:
+            continue
+        change = (r['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0.0
+        print(f"{r['benchmark']:>10} n={r['size']:<6} p50 {old['p50_ms']:.3f} -> {r['p50_ms']:.3f} ms ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the resume analysis pipeline on a synthetic corpus.')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='comma-separated corpus sizes')
+    parser.add_argument('--benchmarks', default=','.join(BENCHMARKS), help='comma-separated benchmarks to run')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--corpus-dir', default=os.path.join(tempfile.gettempdir(), 'resume_bench_corpus'))
+    parser.add_argument('--no-memory', action='store_true', help='skip the peak-memory pass')
+    parser.add_argument('-o', '--output', default='bench_results.json')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    names = [b for b in args.benchmarks.split(',') if b]
+    results = []
+    for size in sizes:
+        docs = build_corpus(size, args.seed, args.corpus_dir, with_pdfs='extract' in names)
+        for name in names:
+            result = run_benchmark(name, docs, measure_memory=not args.no_memory)
+            print(json.dumps(result), file=sys.stderr)
+            results.append(result)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': args.seed,
+            'sizes': sizes,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# --- Content-addressed analysis cache ---
+# Entries are keyed by the SHA-256 of the uploaded PDF bytes, so the same file
+# uploaded again (or a Streamlit rerun after a widget change) skips parsing.
+# Each entry records the version it was written under (Analyzer.ANALYSIS_VERSION);
+# entries from another version are treated as missing, so changing the taxonomy,
+# section rules or result shape invalidates old results.
+
+CACHE_DIR = os.environ.get('RESUME_CACHE_DIR', './Analysis_Cache')
+MAX_MEMORY_ENTRIES = int(os.environ.get('RESUME_CACHE_MEMORY_ENTRIES', 128))
+MAX_DISK_ENTRIES = int(os.environ.get('RESUME_CACHE_DISK_ENTRIES', 2048))
+
+
+def file_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class AnalysisCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_memory_entries=MAX_MEMORY_ENTRIES,
+                 max_disk_entries=MAX_DISK_ENTRIES, version=None):
+        self.cache_dir = cache_dir
+        self.version = version
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_count = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, digest):
+        return os.path.join(self.cache_dir, digest + '.json')
+
+    def get(self, digest):
+        with self._lock:
+            entry = self._memory.get(digest)
+            if entry is not None:
+                self._memory.move_to_end(digest)
+                return entry if self._current(entry) else None
+        if not self.cache_dir:
+            return None
+        path = self._path(digest)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            # Touch the file so disk eviction follows least-recent use
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if not self._current(entry):
+            return None
+        with self._lock:
+            self._remember(digest, entry)
+        return entry
+
+    def _current(self, entry):
+        return self.version is None or (isinstance(entry, dict) and entry.get('cache_version') == self.version)
+
+    def put(self, digest, entry):
+        if self.version is not None:
+            entry = dict(entry, cache_version=self.version)
+        with self._lock:
+            self._remember(digest, entry)
+        if not self.cache_dir:
+            return
+        path = self._path(digest)
+        is_new = not os.path.exists(path)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        if is_new:
+            self._evict_disk()
+
+    def update(self, digest, **fields):
+        entry = dict(self.get(digest) or {})
+        entry.update(fields)
+        self.put(digest, entry)
+        return entry
+
+    def _remember(self, digest, entry):
+        self._memory[digest] = entry
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_entries(self):
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for e in it:
+                if e.name.endswith('.json'):
+                    try:
+                        entries.append((e.stat().st_mtime, e.path))
+                    except OSError:
+                        pass
+        return entries
+
+    def _evict_disk(self):
+        with self._lock:
+            if self._disk_count is None:
+                self._disk_count = len(self._disk_entries())
+            else:
+                self._disk_count += 1
+            if self._disk_count <= self.max_disk_entries:
+                return
+            entries = sorted(self._disk_entries())
+            excess = len(entries) - self.max_disk_entries
+            for _, path in entries[:max(excess, 0)]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._disk_count = len(entries) - max(excess, 0)
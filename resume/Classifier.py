@@ -0,0 +1,153 @@
+import argparse
+import json
+import math
+import os
+import sys
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from Models import get_nlp
+from Taxonomy import fields as FIELDS
+
+# --- Text-based field classifier ---
+# Scores every field against the whole resume text, for resumes whose skill
+# keywords match no field exactly. Each field gets a term vector built from its
+# Taxonomy.py keywords, skills and course titles (lemmatized with the same
+# spaCy pipeline, weighted by how specific a term is to one field). Documents
+# are lemmatized with nlp.pipe in batches with the parser and NER disabled and
+# compared to each field vector by cosine similarity.
+#
+# Usage: python Classifier.py results.jsonl -o fields.jsonl
+# (Batch.py output; records without resume_text are re-extracted from 'path')
+
+CLASSIFIER_BATCH_SIZE = int(os.environ.get('RESUME_CLASSIFIER_BATCH_SIZE', 32))
+# Below this cosine score the text is not treated as evidence for any field
+CLASSIFIER_MIN_SCORE = float(os.environ.get('RESUME_CLASSIFIER_MIN_SCORE', 0.05))
+# Only tokenization, tagging and lemmatization are needed
+DISABLED_PIPES = ('parser', 'ner', 'textcat', 'senter')
+
+SKILL_TERM_WEIGHT = 1.0
+COURSE_TERM_WEIGHT = 0.5
+
+
+def _terms(doc):
+    for token in doc:
+        if token.is_stop or token.is_punct or token.is_space or token.like_num:
+            continue
+        lemma = token.lemma_.lower().strip()
+        if len(lemma) > 1 and not lemma.startswith('-'):
+            yield lemma
+
+
+def _pipe(texts, batch_size=CLASSIFIER_BATCH_SIZE, n_process=1):
+    nlp = get_nlp()
+    # Passing disable= to pipe leaves the shared pipeline untouched for other callers
+    disable = [name for name in DISABLED_PIPES if name in nlp.pipe_names]
+    return nlp.pipe(texts, batch_size=batch_size, disable=disable, n_process=n_process)
+
+
+@lru_cache(maxsize=None)
+def field_vectors():
+    # One unit-length {lemma: weight} vector per field, in Taxonomy order
+    sources = []
+    for idx, field in enumerate(FIELDS):
+        sources.append((idx, field['name'], 1.0))
+        for keyword in field['keywords']:
+            keyword, weight = keyword if isinstance(keyword, tuple) else (keyword, 1.0)
+            sources.append((idx, keyword, weight))
+        sources += [(idx, skill, SKILL_TERM_WEIGHT) for skill in field['skills']]
+        sources += [(idx, name, COURSE_TERM_WEIGHT) for name, _ in field['courses']]
+
+    raw = [defaultdict(float) for _ in FIELDS]
+    for (idx, _, weight), doc in zip(sources, _pipe(text for _, text, _ in sources)):
+        for term in _terms(doc):
+            raw[idx][term] = max(raw[idx][term], weight)
+
+    # Terms shared by several fields say less about any one of them
+    df = Counter(term for vector in raw for term in vector)
+    vectors = []
+    for vector in raw:
+        weighted = {term: weight * math.log(1 + len(FIELDS) / df[term]) for term, weight in vector.items()}
+        norm = math.sqrt(sum(w * w for w in weighted.values())) or 1.0
+        vectors.append({term: w / norm for term, w in weighted.items()})
+    return vectors
+
+
+def _rank(doc, vectors):
+    counts = Counter(_terms(doc))
+    if not counts:
+        return []
+    weights = {term: 1 + math.log(count) for term, count in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    scores = [sum(weights.get(term, 0.0) * w for term, w in vector.items()) / norm for vector in vectors]
+    total = sum(scores)
+    if total <= 0:
+        return []
+    ranking = [{'field': FIELDS[idx]['name'], 'score': round(score, 4), 'confidence': round(score / total, 4)}
+               for idx, score in enumerate(scores) if score > 0]
+    return sorted(ranking, key=lambda item: -item['score'])
+
+
+def classify_texts(texts, batch_size=CLASSIFIER_BATCH_SIZE, n_process=1):
+    # Yields one ranking per text: [{'field', 'score', 'confidence'}, ...], best first
+    vectors = field_vectors()
+    for doc in _pipe(texts, batch_size=batch_size, n_process=n_process):
+        yield _rank(doc, vectors)
+
+
+def classify_text(text):
+    return next(classify_texts([text], batch_size=1))
+
+
+def best_field(ranking, min_score=CLASSIFIER_MIN_SCORE):
+    # Top field name, or '' when the text is not clear enough evidence
+    if ranking and ranking[0]['score'] >= min_score:
+        return ranking[0]['field']
+    return ''
+
+
+def _load_texts(records):
+    for record in records:
+        text = record.get('resume_text')
+        if text is None and record.get('path'):
+            from Extractor import extract_pdf
+            try:
+                text = extract_pdf(record['path'])['text']
+            except Exception:
+                text = ''
+        yield text or ''
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rank career fields for resumes analysed by Batch.py.')
+    parser.add_argument('input', help='JSON Lines output of Batch.py')
+    parser.add_argument('-o', '--output', default='fields.jsonl')
+    parser.add_argument('--batch-size', type=int, default=CLASSIFIER_BATCH_SIZE)
+    parser.add_argument('--processes', type=int, default=1, help='spaCy worker processes for nlp.pipe')
+    args = parser.parse_args(argv)
+
+    records = []
+    with open(args.input, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash can leave a partially written last line
+                continue
+            if isinstance(record, dict) and 'error' not in record:
+                records.append(record)
+    rankings = classify_texts(_load_texts(records), batch_size=args.batch_size, n_process=args.processes)
+    changed = 0
+    with open(args.output, 'w', encoding='utf-8') as out:
+        for record, ranking in zip(records, rankings):
+            field = best_field(ranking)
+            changed += bool(field) and field != record.get('reco_field')
+            out.write(json.dumps({'path': record.get('path'), 'digest': record.get('digest'),
+                                  'reco_field': record.get('reco_field'), 'classified_field': field,
+                                  'field_ranking': ranking}) + '\n')
+    print(json.dumps({'classified': len(records), 'changed': changed}), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
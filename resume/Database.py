@@ -0,0 +1,503 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# --- Database access ---
+# A small connection pool, one-time schema setup and a write-behind queue that
+# batches analysis inserts. RESUME_DB_BACKEND=sqlite runs everything against a
+# local file, which needs no server.
+#
+# Results live in `analyses` (typed columns, indexed by field, level and time)
+# with one `analysis_skills` row per normalized skill; Dedup.py keeps MinHash
+# signatures in `analysis_signatures` / `analysis_lsh_bands`. The original
+# `user_data` table is kept only as the source for Migrate.py.
+
+DB_BACKEND = os.environ.get('RESUME_DB_BACKEND', 'mysql')
+MYSQL_CONFIG = {
+    'host': os.environ.get('RESUME_DB_HOST', 'localhost'),
+    'user': os.environ.get('RESUME_DB_USER', 'root'),
+    'password': os.environ.get('RESUME_DB_PASSWORD', '@Maruti800'),
+    'db': os.environ.get('RESUME_DB_NAME', 'cv'),
+}
+SQLITE_PATH = os.environ.get('RESUME_SQLITE_PATH', './resume_analyser.db')
+POOL_SIZE = int(os.environ.get('RESUME_DB_POOL_SIZE', 5))
+INSERT_BATCH_SIZE = int(os.environ.get('RESUME_INSERT_BATCH_SIZE', 50))
+INSERT_FLUSH_INTERVAL = float(os.environ.get('RESUME_INSERT_FLUSH_INTERVAL', 2.0))
+INSERT_RETRIES = int(os.environ.get('RESUME_INSERT_RETRIES', 3))
+INSERT_RETRY_BACKOFF = float(os.environ.get('RESUME_INSERT_RETRY_BACKOFF', 0.5))
+# Batches that still fail after the retries are kept here and written later
+INSERT_SPILL_PATH = os.environ.get('RESUME_INSERT_SPILL_PATH', './insert_spill.jsonl')
+
+MYSQL_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS user_data (
+        ID INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        Name VARCHAR(500) NOT NULL,
+        Email_ID VARCHAR(500) NOT NULL,
+        resume_score VARCHAR(8) NOT NULL,
+        Timestamp VARCHAR(50) NOT NULL,
+        Page_no VARCHAR(5) NOT NULL,
+        Predicted_Field VARCHAR(100) NOT NULL,
+        User_level VARCHAR(100) NOT NULL,
+        Actual_skills TEXT NOT NULL,
+        Recommended_skills TEXT NOT NULL,
+        Recommended_courses TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analyses (
+        ID INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        legacy_id INT NULL,
+        name VARCHAR(500) NOT NULL,
+        email VARCHAR(500) NOT NULL,
+        resume_score SMALLINT NOT NULL,
+        created_at DATETIME NOT NULL,
+        page_count SMALLINT NOT NULL,
+        predicted_field VARCHAR(100) NOT NULL,
+        user_level VARCHAR(100) NOT NULL,
+        recommended_skills TEXT NOT NULL,
+        recommended_courses TEXT NOT NULL,
+        UNIQUE KEY uq_analyses_legacy_id (legacy_id),
+        KEY idx_analyses_field (predicted_field),
+        KEY idx_analyses_level (user_level),
+        KEY idx_analyses_created_at (created_at)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analysis_skills (
+        analysis_id INT NOT NULL,
+        skill VARCHAR(200) NOT NULL,
+        display_name VARCHAR(200) NOT NULL,
+        PRIMARY KEY (analysis_id, skill),
+        KEY idx_analysis_skills_skill (skill),
+        FOREIGN KEY (analysis_id) REFERENCES analyses (ID) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analysis_signatures (
+        analysis_id INT NOT NULL PRIMARY KEY,
+        digest CHAR(64) NOT NULL,
+        signature BLOB NOT NULL,
+        KEY idx_analysis_signatures_digest (digest),
+        FOREIGN KEY (analysis_id) REFERENCES analyses (ID) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analysis_lsh_bands (
+        band_key BIGINT NOT NULL,
+        analysis_id INT NOT NULL,
+        PRIMARY KEY (band_key, analysis_id),
+        FOREIGN KEY (analysis_id) REFERENCES analyses (ID) ON DELETE CASCADE
+    )
+    """,
+]
+
+SQLITE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS user_data (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        Name TEXT NOT NULL,
+        Email_ID TEXT NOT NULL,
+        resume_score TEXT NOT NULL,
+        Timestamp TEXT NOT NULL,
+        Page_no TEXT NOT NULL,
+        Predicted_Field TEXT NOT NULL,
+        User_level TEXT NOT NULL,
+        Actual_skills TEXT NOT NULL,
+        Recommended_skills TEXT NOT NULL,
+        Recommended_courses TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analyses (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        legacy_id INTEGER UNIQUE,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        resume_score INTEGER NOT NULL,
+        created_at TEXT NOT NULL,
+        page_count INTEGER NOT NULL,
+        predicted_field TEXT NOT NULL,
+        user_level TEXT NOT NULL,
+        recommended_skills TEXT NOT NULL,
+        recommended_courses TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_analyses_field ON analyses (predicted_field)",
+    "CREATE INDEX IF NOT EXISTS idx_analyses_level ON analyses (user_level)",
+    "CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses (created_at)",
+    """
+    CREATE TABLE IF NOT EXISTS analysis_skills (
+        analysis_id INTEGER NOT NULL REFERENCES analyses (ID) ON DELETE CASCADE,
+        skill TEXT NOT NULL,
+        display_name TEXT NOT NULL,
+        PRIMARY KEY (analysis_id, skill)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_analysis_skills_skill ON analysis_skills (skill)",
+    """
+    CREATE TABLE IF NOT EXISTS analysis_signatures (
+        analysis_id INTEGER PRIMARY KEY REFERENCES analyses (ID) ON DELETE CASCADE,
+        digest TEXT NOT NULL,
+        signature BLOB NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_analysis_signatures_digest ON analysis_signatures (digest)",
+    """
+    CREATE TABLE IF NOT EXISTS analysis_lsh_bands (
+        band_key INTEGER NOT NULL,
+        analysis_id INTEGER NOT NULL REFERENCES analyses (ID) ON DELETE CASCADE,
+        PRIMARY KEY (band_key, analysis_id)
+    )
+    """,
+]
+
+
+class ConnectionPool:
+    def __init__(self, connect, size=POOL_SIZE, timeout=30):
+        self._connect = connect
+        self._size = size
+        self._timeout = timeout
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self._size)
+
+    def _check_pid(self):
+        # A forked child (e.g. a ProcessPoolExecutor worker) inherits the parent's
+        # idle connections, whose sockets the parent is still using. They are
+        # dropped without close(), which would end the parent's sessions too.
+        if self._pid != os.getpid():
+            self._reset()
+
+    @contextmanager
+    def connection(self):
+        self._check_pid()
+        idle, slots = self._idle, self._slots
+        if not slots.acquire(timeout=self._timeout):
+            raise TimeoutError('No database connection available')
+        try:
+            try:
+                conn = idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            except Exception:
+                # Roll back and reuse; connections that cannot even roll back are dropped
+                try:
+                    conn.rollback()
+                    idle.put(conn)
+                except Exception:
+                    _close_quietly(conn)
+                raise
+            else:
+                idle.put(conn)
+        finally:
+            slots.release()
+
+    def close(self):
+        self._check_pid()
+        while True:
+            try:
+                _close_quietly(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class Database:
+    def __init__(self, backend=DB_BACKEND, sqlite_path=SQLITE_PATH, mysql_config=None, pool_size=POOL_SIZE):
+        self.backend = backend
+        self.sqlite_path = sqlite_path
+        self.mysql_config = dict(mysql_config or MYSQL_CONFIG)
+        self.placeholder = '?' if backend == 'sqlite' else '%s'
+        self.pool = ConnectionPool(self._connect, pool_size)
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _connect(self):
+        if self.backend == 'sqlite':
+            conn = sqlite3.connect(self.sqlite_path, check_same_thread=False, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            return conn
+        import pymysql
+        return pymysql.connect(**self.mysql_config)
+
+    def _create_mysql_database(self):
+        import pymysql
+        config = dict(self.mysql_config)
+        name = config.pop('db')
+        conn = pymysql.connect(**config)
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"CREATE DATABASE IF NOT EXISTS {name}")
+        finally:
+            conn.close()
+
+    def ensure_schema(self):
+        # Runs the DDL once per process instead of on every Streamlit rerun
+        if self._pid != os.getpid():
+            # The lock may have been held by another thread when this process was forked
+            self._schema_lock = threading.Lock()
+            self._pid = os.getpid()
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            if self.backend == 'sqlite':
+                statements = SQLITE_SCHEMA
+            else:
+                self._create_mysql_database()
+                statements = MYSQL_SCHEMA
+            with self.pool.connection() as conn:
+                cur = conn.cursor()
+                for statement in statements:
+                    cur.execute(statement)
+                conn.commit()
+                cur.close()
+            self._schema_ready = True
+
+    @contextmanager
+    def connection(self):
+        self.ensure_schema()
+        with self.pool.connection() as conn:
+            yield conn
+
+    def sql(self, statement):
+        # Queries are written with %s placeholders; sqlite3 wants ?
+        return statement.replace('%s', '?') if self.placeholder == '?' else statement
+
+    def query(self, statement, params=()):
+        with self.connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(self.sql(statement), params)
+                return cur.fetchall()
+            finally:
+                cur.close()
+
+    def executemany(self, statement, rows):
+        with self.connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.executemany(self.sql(statement), rows)
+                conn.commit()
+            finally:
+                cur.close()
+
+    def close(self):
+        self.pool.close()
+
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def normalize_skill(skill):
+    return ' '.join(str(skill).lower().split())[:200]
+
+
+def analysis_row(name, email, res_score, created_at, no_of_pages, reco_field, cand_level, skills,
+                 recommended_skills, courses, legacy_id=None):
+    # created_at is a datetime; recommended skills/courses are display-only and stay JSON
+    return {
+        'legacy_id': legacy_id,
+        'name': name or '',
+        'email': email or '',
+        'resume_score': int(res_score or 0),
+        'created_at': created_at.strftime(TIMESTAMP_FORMAT),
+        'page_count': int(no_of_pages or 0),
+        'predicted_field': reco_field or '',
+        'user_level': cand_level or '',
+        'skills': list(skills or []),
+        'recommended_skills': json.dumps(recommended_skills or []),
+        'recommended_courses': json.dumps(courses or []),
+    }
+
+
+ANALYSIS_COLUMNS = ['legacy_id', 'name', 'email', 'resume_score', 'created_at', 'page_count',
+                    'predicted_field', 'user_level', 'recommended_skills', 'recommended_courses']
+
+INSERT_ANALYSIS_SQL = (
+    f"INSERT INTO analyses ({', '.join(ANALYSIS_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * len(ANALYSIS_COLUMNS))})"
+)
+INSERT_ANALYSIS_SKILL_SQL = "INSERT INTO analysis_skills (analysis_id, skill, display_name) VALUES (%s, %s, %s)"
+
+
+def write_analyses(database, rows):
+    # One transaction per batch; each row gets its new ID in row['id']
+    with database.connection() as conn:
+        cur = conn.cursor()
+        try:
+            skill_rows = []
+            for row in rows:
+                cur.execute(database.sql(INSERT_ANALYSIS_SQL), tuple(row[c] for c in ANALYSIS_COLUMNS))
+                row['id'] = cur.lastrowid
+                seen = set()
+                for skill in row['skills']:
+                    key = normalize_skill(skill)
+                    if key and key not in seen:
+                        seen.add(key)
+                        skill_rows.append((row['id'], key, str(skill).strip()[:200]))
+            if skill_rows:
+                cur.executemany(database.sql(INSERT_ANALYSIS_SKILL_SQL), skill_rows)
+            conn.commit()
+        finally:
+            cur.close()
+    return rows
+
+
+_STOP = object()
+
+
+class InsertQueue:
+    def __init__(self, database, batch_size=INSERT_BATCH_SIZE, flush_interval=INSERT_FLUSH_INTERVAL,
+                 max_pending=10000, retries=INSERT_RETRIES, retry_backoff=INSERT_RETRY_BACKOFF,
+                 spill_path=INSERT_SPILL_PATH):
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.spill_path = spill_path
+        # Rows are dicts from analysis_row(); flush requests (Events) and _STOP travel the same queue
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._listeners = []
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='analysis-writer', daemon=True)
+        self._thread.start()
+
+    def put(self, row):
+        self._queue.put(row)
+
+    def add_listener(self, callback):
+        # callback(rows) runs on the writer thread after each committed batch; rows carry their new 'id'
+        self._listeners.append(callback)
+
+    def flush(self, timeout=None):
+        # Blocks until everything queued before this call has been written
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=10):
+        if not self._stopped.is_set():
+            self.flush(timeout)
+            self._stopped.set()
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _write(self, rows):
+        # Retries with exponential backoff; a batch that still fails is spilled to disk
+        for attempt in range(self.retries + 1):
+            try:
+                write_analyses(self.database, rows)
+                break
+            except Exception:
+                if attempt == self.retries:
+                    logger.exception('Failed to write %d analysis rows, spilling them to %s',
+                                     len(rows), self.spill_path)
+                    self._spill(rows)
+                    return False
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning('Writing %d analysis rows failed, retrying in %.1fs', len(rows), delay, exc_info=True)
+                time.sleep(delay)
+        self._notify(rows)
+        return True
+
+    def _notify(self, rows):
+        for callback in self._listeners:
+            try:
+                callback(rows)
+            except Exception:
+                logger.exception('Insert listener %r failed', callback)
+
+    def _spill(self, rows):
+        if not self.spill_path:
+            return
+        try:
+            with open(self.spill_path, 'a', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps({k: v for k, v in row.items() if k != 'id'}, default=str) + '\n')
+        except OSError:
+            logger.exception('Could not spill %d analysis rows; they are lost', len(rows))
+
+    def _replay_spill(self):
+        # Writes spilled rows once the database is reachable again
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return
+        replay_path = self.spill_path + '.replay'
+        try:
+            os.replace(self.spill_path, replay_path)
+            with open(replay_path, 'r', encoding='utf-8') as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError):
+            logger.exception('Could not read spilled analysis rows from %s', self.spill_path)
+            return
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            try:
+                write_analyses(self.database, batch)
+            except Exception:
+                logger.warning('Spilled analysis rows still cannot be written', exc_info=True)
+                self._spill(rows[start:])
+                break
+            self._notify(batch)
+        os.remove(replay_path)
+
+    def _run(self):
+        self._replay_spill()
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if isinstance(item, dict):
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size and time.monotonic() < deadline:
+                    continue
+            # Batch full, interval elapsed, flush requested or shutting down
+            if batch:
+                if self._write(batch):
+                    self._replay_spill()
+                batch = []
+            deadline = None
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                return
+
+
+@lru_cache(maxsize=None)
+def get_database():
+    return Database()
+
+
+@lru_cache(maxsize=None)
+def get_insert_queue():
+    insert_queue = InsertQueue(get_database())
+    atexit.register(insert_queue.close)
+    return insert_queue
@@ -0,0 +1,208 @@
+import argparse
+import csv
+import hashlib
+import logging
+import os
+import random
+import struct
+import sys
+import zlib
+from collections import defaultdict
+from functools import lru_cache
+
+from Database import get_database, get_insert_queue
+from Matcher import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# --- Near-duplicate resume detection ---
+# Each analysed resume gets a MinHash signature of its word shingles, stored
+# with LSH band keys in analysis_signatures / analysis_lsh_bands. A new upload
+# only compares itself against analyses sharing at least one band key (an
+# indexed lookup), so checking stays fast however many resumes are stored.
+#
+# Usage: python Dedup.py --report dedup.csv [--threshold 0.85]
+
+NUM_PERM = 128
+LSH_BANDS = 16  # 16 bands of 8 rows: pairs above ~0.7 similarity almost always share a band
+SHINGLE_SIZE = 5
+DEDUP_THRESHOLD = float(os.environ.get('RESUME_DEDUP_THRESHOLD', 0.85))
+DEDUP_MAX_CANDIDATES = 50
+REPORT_BATCH_SIZE = 5000
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed seed: stored signatures must stay comparable across processes and releases
+_rng = random.Random(20240101)
+PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+INSERT_SIGNATURE_SQL = "INSERT INTO analysis_signatures (analysis_id, digest, signature) VALUES (%s, %s, %s)"
+INSERT_BAND_SQL = "INSERT INTO analysis_lsh_bands (band_key, analysis_id) VALUES (%s, %s)"
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    words = normalize_text(text).split()
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(text):
+    # NUM_PERM 32-bit values, or None when there is no text to compare
+    hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return [min([(a * h + b) % _PRIME for h in hashes]) & _MAX_HASH for a, b in PERMUTATIONS]
+
+
+def similarity(signature_a, signature_b):
+    # Estimated Jaccard similarity of the two shingle sets
+    return sum(x == y for x, y in zip(signature_a, signature_b)) / NUM_PERM
+
+
+def band_keys(signature):
+    rows = NUM_PERM // LSH_BANDS
+    keys = []
+    for band in range(LSH_BANDS):
+        data = struct.pack(f'<H{rows}I', band, *signature[band * rows:(band + 1) * rows])
+        keys.append(int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little', signed=True))
+    return keys
+
+
+def pack_signature(signature):
+    return struct.pack(f'<{NUM_PERM}I', *signature)
+
+
+def unpack_signature(blob):
+    return list(struct.unpack(f'<{NUM_PERM}I', bytes(blob)))
+
+
+class DuplicateIndex:
+    def __init__(self, database, threshold=DEDUP_THRESHOLD):
+        self.database = database
+        self.threshold = threshold
+
+    def find(self, signature):
+        # Returns the most similar stored analysis as {'analysis_id', 'digest', 'similarity'}, or None
+        keys = band_keys(signature)
+        candidates = [row[0] for row in self.database.query(
+            f"SELECT DISTINCT analysis_id FROM analysis_lsh_bands WHERE band_key IN ({', '.join(['%s'] * len(keys))}) "
+            "LIMIT %s", keys + [DEDUP_MAX_CANDIDATES])]
+        if not candidates:
+            return None
+        best = None
+        for analysis_id, digest, blob in self.database.query(
+                "SELECT analysis_id, digest, signature FROM analysis_signatures "
+                f"WHERE analysis_id IN ({', '.join(['%s'] * len(candidates))})", candidates):
+            score = similarity(signature, unpack_signature(blob))
+            if score >= self.threshold and (best is None or score > best['similarity']):
+                best = {'analysis_id': analysis_id, 'digest': digest, 'similarity': score}
+        return best
+
+    def find_digest(self, digest):
+        # ID of a stored analysis of byte-identical content, or None
+        rows = self.database.query("SELECT analysis_id FROM analysis_signatures WHERE digest = %s LIMIT 1", (digest,))
+        return rows[0][0] if rows else None
+
+    def lookup(self, signature):
+        # find(), but a failed lookup must not fail the upload; it is then just stored normally
+        try:
+            return self.find(signature)
+        except Exception:
+            logger.exception('Duplicate lookup failed')
+            return None
+
+
+def store_signatures(rows, database=None):
+    # Insert queue listener: rows persisted with a 'signature' become searchable
+    signed = [row for row in rows if row.get('signature') and row.get('id')]
+    if not signed:
+        return
+    database = database or get_database()
+    with database.connection() as conn:
+        cur = conn.cursor()
+        try:
+            cur.executemany(database.sql(INSERT_SIGNATURE_SQL),
+                            [(row['id'], row.get('digest') or '', pack_signature(row['signature'])) for row in signed])
+            cur.executemany(database.sql(INSERT_BAND_SQL),
+                            [(key, row['id']) for row in signed for key in set(band_keys(row['signature']))])
+            conn.commit()
+        finally:
+            cur.close()
+
+
+@lru_cache(maxsize=None)
+def enable_signature_store():
+    # Registers store_signatures on this process's insert queue, once
+    get_insert_queue().add_listener(store_signatures)
+
+
+def find_duplicate_groups(database, threshold=DEDUP_THRESHOLD, batch_size=REPORT_BATCH_SIZE):
+    # Groups of near-duplicate analyses: {first ID: [(ID, similarity to the first), ...]}
+    buckets = defaultdict(list)
+    signatures = {}
+    first_of = {}
+    groups = defaultdict(list)
+    last_id = 0
+    while True:
+        rows = database.query("SELECT analysis_id, signature FROM analysis_signatures WHERE analysis_id > %s "
+                              "ORDER BY analysis_id LIMIT %s", (last_id, batch_size))
+        if not rows:
+            break
+        for analysis_id, blob in rows:
+            signature = unpack_signature(blob)
+            candidates = set()
+            for key in band_keys(signature):
+                candidates.update(buckets[key])
+                buckets[key].append(analysis_id)
+            best = None
+            for other in candidates:
+                score = similarity(signature, signatures[other])
+                if score >= threshold and (best is None or score > best[1]):
+                    best = (other, score)
+            signatures[analysis_id] = signature
+            if best is not None:
+                # Join the group of the earliest upload it resembles
+                first = first_of.get(best[0], best[0])
+                first_of[analysis_id] = first
+                groups[first].append((analysis_id, similarity(signature, signatures[first])))
+        last_id = rows[-1][0]
+    return groups
+
+
+def write_report(database, path, threshold=DEDUP_THRESHOLD):
+    groups = find_duplicate_groups(database, threshold)
+    ids = [first for first in groups] + [analysis_id for members in groups.values() for analysis_id, _ in members]
+    details = {}
+    for start in range(0, len(ids), 1000):
+        chunk = ids[start:start + 1000]
+        for row in database.query("SELECT ID, name, email, created_at, predicted_field FROM analyses "
+                                  f"WHERE ID IN ({', '.join(['%s'] * len(chunk))})", chunk):
+            details[row[0]] = row[1:]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['group', 'ID', 'duplicate_of', 'similarity', 'Name', 'Email_ID', 'Timestamp', 'Predicted_Field'])
+        for group, (first, members) in enumerate(sorted(groups.items()), start=1):
+            writer.writerow([group, first, '', 1.0] + list(details.get(first, ('', '', '', ''))))
+            for analysis_id, score in members:
+                writer.writerow([group, analysis_id, first, round(score, 3)]
+                                + list(details.get(analysis_id, ('', '', '', ''))))
+    return {'groups': len(groups), 'duplicates': sum(len(members) for members in groups.values())}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report groups of near-duplicate analysed resumes.')
+    parser.add_argument('--report', default='dedup_report.csv', help='CSV file to write')
+    parser.add_argument('--threshold', type=float, default=DEDUP_THRESHOLD, help='minimum estimated similarity')
+    args = parser.parse_args(argv)
+    database = get_database()
+    try:
+        summary = write_report(database, args.report, args.threshold)
+    finally:
+        database.close()
+    print(f"{summary['duplicates']} duplicates in {summary['groups']} groups written to {args.report}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
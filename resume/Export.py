@@ -0,0 +1,138 @@
+import csv
+import json
+import os
+import tempfile
+import time
+
+from Admin import display_query
+
+# --- Streaming table export ---
+# Rows are read from a server-side cursor in chunks and written straight to a
+# file, so the full table is never held in memory or embedded in the page.
+
+EXPORT_DIR = os.environ.get('RESUME_EXPORT_DIR', os.path.join(tempfile.gettempdir(), 'resume_exports'))
+EXPORT_CHUNK_SIZE = int(os.environ.get('RESUME_EXPORT_CHUNK_SIZE', 5000))
+# Exports nobody downloaded (e.g. from closed sessions) are removed after this many seconds
+EXPORT_RETENTION = float(os.environ.get('RESUME_EXPORT_RETENTION', 3600))
+JSON_LIST_COLUMNS = ('Recommended_skills', 'Recommended_courses')
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def export_formats():
+    return ['csv', 'parquet'] if parquet_available() else ['csv']
+
+
+def _display_value(value, is_list_column):
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='replace')
+    if is_list_column and isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            return value
+        if isinstance(parsed, list):
+            return ', '.join(map(str, parsed))
+    return value
+
+
+def iter_chunks(database, query=None, chunk_size=EXPORT_CHUNK_SIZE):
+    # Yields (columns, rows) chunks; list columns are flattened like the Admin table
+    query = query or display_query(database)
+    with database.connection() as conn:
+        if database.backend == 'sqlite':
+            cur = conn.cursor()
+        else:
+            import pymysql
+            cur = conn.cursor(pymysql.cursors.SSCursor)
+        try:
+            cur.execute(query)
+            columns = [d[0] for d in cur.description]
+            list_columns = [c in JSON_LIST_COLUMNS for c in columns]
+            first = True
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                # An empty table still yields once so the header/schema gets written
+                if not rows and not first:
+                    break
+                first = False
+                yield columns, [tuple(_display_value(v, is_list) for v, is_list in zip(row, list_columns))
+                                for row in rows]
+                if not rows:
+                    break
+        finally:
+            cur.close()
+
+
+def _write_csv(chunks, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        header_written = False
+        for columns, rows in chunks:
+            if not header_written:
+                writer.writerow(columns)
+                header_written = True
+            writer.writerows(rows)
+
+
+def _write_parquet(chunks, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for columns, rows in chunks:
+            data = {c: [row[i] if c == 'ID' or row[i] is None else str(row[i]) for row in rows]
+                    for i, c in enumerate(columns)}
+            if writer is None:
+                schema = pa.schema([(c, pa.int64() if c == 'ID' else pa.string()) for c in columns])
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(pa.Table.from_pydict(data, schema=writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def remove_export(path):
+    if path:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def prune_exports(max_age=EXPORT_RETENTION):
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def export_table(database, fmt='csv', path=None, chunk_size=EXPORT_CHUNK_SIZE):
+    if fmt not in ('csv', 'parquet'):
+        raise ValueError(f'Unsupported export format {fmt!r}')
+    if fmt == 'parquet' and not parquet_available():
+        raise RuntimeError('Parquet export needs pyarrow installed')
+    if path is None:
+        prune_exports()
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        path = os.path.join(EXPORT_DIR, f"user_data_{time.strftime('%Y%m%d_%H%M%S')}.{fmt}")
+    tmp_path = path + '.part'
+    chunks = iter_chunks(database, chunk_size=chunk_size)
+    if fmt == 'csv':
+        _write_csv(chunks, tmp_path)
+    else:
+        _write_parquet(chunks, tmp_path)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,79 @@
+import atexit
+import io
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from pdfminer3.layout import LAParams
+from pdfminer3.pdfpage import PDFPage
+from pdfminer3.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer3.converter import TextConverter
+
+# --- Single-pass PDF extraction ---
+# Each resume is laid out once; the per-page text and page count feed both the
+# entity extraction in Parser.py and the section-based scoring.
+
+EXTRACT_WORKERS = int(os.environ.get('RESUME_EXTRACT_WORKERS', min(4, os.cpu_count() or 1)))
+# Below this many pages the process start-up costs more than the layout work
+PARALLEL_MIN_PAGES = int(os.environ.get('RESUME_PARALLEL_MIN_PAGES', 6))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+            atexit.register(_pool.shutdown, wait=False)
+        return _pool
+
+
+def count_pages(path):
+    with open(path, 'rb') as fh:
+        return sum(1 for _ in PDFPage.get_pages(fh, caching=True, check_extractable=True))
+
+
+def layout_pages(path, pagenos=None):
+    # Lays out the requested pages (all when None) and returns their text in order
+    resource_manager = PDFResourceManager()
+    text_handle = io.StringIO()
+    converter = TextConverter(resource_manager, text_handle, laparams=LAParams())
+    page_interpreter = PDFPageInterpreter(resource_manager, converter)
+    pages = []
+    start = 0
+    try:
+        with open(path, 'rb') as fh:
+            for page in PDFPage.get_pages(fh, pagenos=pagenos, caching=True, check_extractable=True):
+                page_interpreter.process_page(page)
+                text = text_handle.getvalue()
+                pages.append(text[start:])
+                start = len(text)
+    finally:
+        converter.close()
+        text_handle.close()
+    return pages
+
+
+def _page_chunks(page_count, workers):
+    size = -(-page_count // workers)
+    return [set(range(i, min(i + size, page_count))) for i in range(0, page_count, size)]
+
+
+def extract_pdf(path, workers=None):
+    workers = EXTRACT_WORKERS if workers is None else workers
+    page_count = count_pages(path)
+    if workers > 1 and page_count >= PARALLEL_MIN_PAGES:
+        chunks = _page_chunks(page_count, workers)
+        pool = _get_pool()
+        pages = []
+        for chunk_pages in pool.map(layout_pages, [path] * len(chunks), chunks):
+            pages.extend(chunk_pages)
+    else:
+        pages = layout_pages(path)
+    return {
+        'pages': pages,
+        'page_count': page_count,
+        'text': ''.join(pages),
+    }
@@ -0,0 +1,266 @@
+import datetime
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+from Analyzer import analyse_resume, field_courses
+from Database import analysis_row, get_database, get_insert_queue
+from Dedup import DuplicateIndex, enable_signature_store
+from Metrics import MetricsRegistry, RequestTrace
+
+logger = logging.getLogger(__name__)
+
+# --- Asynchronous analysis jobs ---
+# Uploads become jobs on a bounded local queue. A fixed set of dispatcher
+# threads hands each job to a process pool for the CPU-heavy parse, then
+# persists the result to the analyses table. The UI polls Job.status / Job.stage.
+# Near-duplicates of earlier uploads are analysed but add no row; byte-identical
+# re-uploads, including ones answered from the cache, add no row either.
+
+JOB_WORKERS = int(os.environ.get('RESUME_JOB_WORKERS', 2))
+JOB_QUEUE_SIZE = int(os.environ.get('RESUME_JOB_QUEUE_SIZE', 20))
+JOB_RETENTION = float(os.environ.get('RESUME_JOB_RETENTION', 3600))
+DEFAULT_COURSE_COUNT = 5
+# Workers must not be forked from the threaded app process (dispatcher and
+# insert-queue threads may hold locks mid-operation); forkserver where the
+# platform has it, spawn elsewhere
+JOB_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, job_id, path, digest, size_bytes=0, stages=None, fields=None):
+        self.id = job_id
+        self.path = path
+        self.digest = digest
+        self.size_bytes = size_bytes
+        # Stage records timed before submission (e.g. the upload save) and extra
+        # trace fields; the job's trace is the only one recorded per analysis
+        self.stages = list(stages or [])
+        self.fields = dict(fields or {})
+        self.status = 'queued'  # queued -> running -> done | failed
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self._stage = 'queued'
+        self._stage_board = None
+        self._done = threading.Event()
+
+    @property
+    def stage(self):
+        # While running, the worker process publishes its current stage on the board
+        if self.status == 'running' and self._stage_board is not None:
+            try:
+                return self._stage_board.get(self.id, self._stage)
+            except Exception:
+                return self._stage
+        return self._stage
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+
+@lru_cache(maxsize=None)
+def _worker_duplicates():
+    # One index per worker process
+    return DuplicateIndex(get_database())
+
+
+def _run_analysis(path, digest, job_id, stage_board):
+    # Runs in a worker process; stage timings (and the path of a slow-analysis
+    # profile, when RESUME_PROFILE_SLOW_MS is set) come back with the result
+    def on_stage(stage):
+        stage_board[job_id] = stage
+
+    trace = RequestTrace(registry=MetricsRegistry(), digest=digest)
+    # Default extract workers: PDFs of PARALLEL_MIN_PAGES or more are laid out
+    # in parallel, shorter ones stay in this process
+    analysis = analyse_resume(path, digest=digest, on_stage=on_stage, trace=trace,
+                              duplicates=_worker_duplicates())
+    trace.stop()
+    return analysis, trace.stages, trace.stop_profile()
+
+
+def persist_analysis(analysis, course_count=DEFAULT_COURSE_COUNT):
+    # Queues one analyses row; returns the shuffled course list it drew from
+    resume_data = analysis['resume_data']
+    course_order = list(field_courses(analysis['reco_field']))
+    random.shuffle(course_order)
+    rec_course = [name for name, _ in course_order[:course_count]]
+    row = analysis_row(
+        resume_data.get('name') or '',
+        resume_data.get('email') or '',
+        analysis['resume_score'],
+        datetime.datetime.now(),
+        analysis['pages'],
+        analysis['reco_field'],
+        analysis['cand_level'],
+        resume_data.get('skills') or [],
+        analysis['recommended_skills'],
+        rec_course,
+    )
+    # Picked up by Dedup.store_signatures once the row is written
+    row.update(digest=analysis.get('digest'), signature=analysis.get('signature'))
+    get_insert_queue().put(row)
+    return course_order
+
+
+class JobQueue:
+    def __init__(self, workers=JOB_WORKERS, max_queued=JOB_QUEUE_SIZE, cache=None):
+        self.workers = workers
+        self.cache = cache
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._mp_context = multiprocessing.get_context(JOB_START_METHOD)
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=self._mp_context)
+        self._manager = self._mp_context.Manager()
+        self._stage_board = self._manager.dict()
+        # Exact re-uploads are caught by digest in the dispatcher. Digests queued
+        # by this process count too until their rows (and signatures) are written
+        self._duplicates = DuplicateIndex(get_database())
+        self._pending_digests = set()
+        enable_signature_store()
+        get_insert_queue().add_listener(self._written)
+        self._threads = [threading.Thread(target=self._dispatch, name=f'analysis-job-{i}', daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, path, digest, size_bytes=0, stages=None, **fields):
+        self._prune()
+        with self._lock:
+            job = Job(f'{os.getpid()}-{next(self._ids)}', path, digest, size_bytes, stages, fields)
+            job._stage_board = self._stage_board
+        try:
+            # Backpressure: refuse new work rather than queueing without bound
+            self._queue.put_nowait(job)
+        except queue.Full:
+            raise JobQueueFull(f'{self._queue.maxsize} analyses already waiting') from None
+        with self._lock:
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _prune(self):
+        cutoff = time.time() - JOB_RETENTION
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if j.finished_at and j.finished_at < cutoff]:
+                del self._jobs[job_id]
+
+    def _dispatch(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._run(job)
+
+    def _run(self, job):
+        # The dispatcher only waits on the worker, so profiling happens there instead
+        trace = RequestTrace(profile=False, bytes=job.size_bytes, digest=job.digest, job=job.id, **job.fields)
+        trace.add_stages(job.stages)
+        trace.fields['queue_wait'] = round(time.time() - job.submitted_at, 6)
+        job.status = 'running'
+        try:
+            analysis = self.cache.get(job.digest) if self.cache is not None else None
+            if analysis and 'resume_score' in analysis:
+                trace.fields['cache_hit'] = True
+            else:
+                trace.stage('analyse')
+                pool = self._pool
+                try:
+                    analysis, stages, profile = pool.submit(
+                        _run_analysis, job.path, job.digest, job.id, self._stage_board).result()
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed for memory); this job fails, later ones get a new pool
+                    self._replace_pool(pool)
+                    raise
+                trace.stop()
+                self._stage_board.pop(job.id, None)
+                trace.fields['pages'] = analysis.get('pages')
+                trace.add_stages(stages)
+                if profile:
+                    trace.fields['profile'] = profile
+                if self.cache is not None:
+                    self.cache.put(job.digest, analysis)
+            result = dict(analysis)
+            if not result.get('duplicate_of') and analysis['resume_data'] and not self._claim(job.digest):
+                result.update(duplicate_of=job.digest, similarity=1.0)
+            if result.get('duplicate_of'):
+                trace.fields['duplicate_of'] = result['duplicate_of']
+            elif analysis['resume_data']:
+                job._stage = 'persist'
+                trace.stage('persist')
+                try:
+                    result['course_order'] = persist_analysis(analysis)
+                except Exception:
+                    self._written([{'digest': job.digest}])
+                    raise
+            job.result = result
+            job.status = 'done'
+            trace.finish()
+        except Exception as e:
+            logger.exception('Analysis job %s failed', job.id)
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = 'failed'
+            trace.finish('error')
+        finally:
+            job._stage = job.status
+            job.finished_at = time.time()
+            self._stage_board.pop(job.id, None)
+            job._done.set()
+
+    def _claim(self, digest):
+        # Reserves digest for persisting; False when these exact bytes are already stored or queued
+        try:
+            stored = self._duplicates.find_digest(digest) is not None
+        except Exception:
+            # As with near-duplicate lookups, a failed check must not fail the upload
+            logger.exception('Digest lookup failed')
+            stored = False
+        with self._lock:
+            if stored or digest in self._pending_digests:
+                return False
+            self._pending_digests.add(digest)
+            return True
+
+    def _written(self, rows):
+        # Insert queue listener, registered after store_signatures: written digests are found by find_digest
+        with self._lock:
+            self._pending_digests.difference_update(row.get('digest') for row in rows)
+
+    def _replace_pool(self, broken):
+        with self._lock:
+            # Several dispatchers may see the same broken pool; only the first replaces it
+            if self._pool is broken:
+                logger.warning('Analysis worker pool broke; starting a new one')
+                broken.shutdown(wait=False)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._mp_context)
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        self._pool.shutdown(wait=False)
+        self._manager.shutdown()
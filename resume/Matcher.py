@@ -0,0 +1,82 @@
+from collections import deque
+
+# --- Multi-pattern keyword matcher (Aho-Corasick) ---
+# All keywords are compiled into one automaton, so a text is scanned once in
+# linear time no matter how many keywords are registered. Matches must sit on
+# word boundaries, so 'ui' does not fire inside 'build'.
+
+
+def normalize_text(text):
+    return ' '.join((text or '').lower().split())
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordMatcher:
+    def __init__(self):
+        # Node 0 is the root; each node has goto edges, a failure link and outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._built = False
+
+    def add(self, keyword, value):
+        keyword = normalize_text(keyword)
+        if not keyword:
+            return
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(keyword), value))
+        self._built = False
+
+    def build(self):
+        queue = deque(self._goto[0].values())
+        for child in queue:
+            self._fail[child] = 0
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+        return self
+
+    def find_all(self, text, normalized=False):
+        # Yields (start, end, value) for every whole-word keyword occurrence
+        if not self._built:
+            self.build()
+        if not normalized:
+            text = normalize_text(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        size = len(text)
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            if end < size and _is_word_char(text[end]) and _is_word_char(ch):
+                continue
+            for length, value in out[node]:
+                start = end - length
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                yield start, end, value
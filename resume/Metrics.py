@@ -0,0 +1,200 @@
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+logger = logging.getLogger('resume.metrics')
+
+# --- Per-stage timing instrumentation ---
+# Each analysis carries a RequestTrace that times its stages. Durations feed
+# rolling percentiles kept in memory, exposed in Prometheus text format, and
+# every finished trace is logged as one JSON line.
+# RESUME_PROFILE_SLOW_MS=<ms> turns on cProfile; profiles of analyses slower
+# than that are kept in RESUME_PROFILE_DIR (only the slowest few).
+
+WINDOW_SIZE = int(os.environ.get('RESUME_METRICS_WINDOW', 1000))
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+METRICS_FILE = os.environ.get('RESUME_METRICS_FILE')  # e.g. a node_exporter textfile path
+PROFILE_SLOW_MS = float(os.environ.get('RESUME_PROFILE_SLOW_MS', 0))
+PROFILE_DIR = os.environ.get('RESUME_PROFILE_DIR', './Profiles')
+PROFILE_KEEP = int(os.environ.get('RESUME_PROFILE_KEEP', 5))
+LOG_FILE = os.environ.get('RESUME_METRICS_LOG')  # JSON lines go to stderr when unset
+
+if not logger.handlers:
+    _handler = logging.FileHandler(LOG_FILE) if LOG_FILE else logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    idx = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[idx]
+
+
+class MetricsRegistry:
+    def __init__(self, window_size=WINDOW_SIZE):
+        self._lock = threading.Lock()
+        self._durations = defaultdict(lambda: deque(maxlen=window_size))
+        self._sums = defaultdict(float)
+        self._counts = defaultdict(int)
+        self._outcomes = defaultdict(int)
+        self._bytes = defaultdict(int)
+        self._pages = defaultdict(int)
+
+    def observe(self, stage, seconds, outcome='ok', size_bytes=0, pages=0):
+        with self._lock:
+            self._durations[stage].append(seconds)
+            self._sums[stage] += seconds
+            self._counts[stage] += 1
+            self._outcomes[(stage, outcome)] += 1
+            self._bytes[stage] += size_bytes or 0
+            self._pages[stage] += pages or 0
+
+    def snapshot(self):
+        with self._lock:
+            stages = {}
+            for stage, window in self._durations.items():
+                values = sorted(window)
+                stages[stage] = {
+                    'count': self._counts[stage],
+                    'sum': self._sums[stage],
+                    'quantiles': {q: _percentile(values, q) for q in QUANTILES},
+                    'bytes': self._bytes[stage],
+                    'pages': self._pages[stage],
+                }
+            outcomes = dict(self._outcomes)
+        return stages, outcomes
+
+    def prometheus_text(self):
+        stages, outcomes = self.snapshot()
+        lines = [
+            '# HELP resume_stage_duration_seconds Analysis stage duration (rolling window quantiles).',
+            '# TYPE resume_stage_duration_seconds summary',
+        ]
+        for stage, data in sorted(stages.items()):
+            for q, value in data['quantiles'].items():
+                lines.append(f'resume_stage_duration_seconds{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'resume_stage_duration_seconds_sum{{stage="{stage}"}} {data["sum"]:.6f}')
+            lines.append(f'resume_stage_duration_seconds_count{{stage="{stage}"}} {data["count"]}')
+        lines += ['# HELP resume_stage_total Analysis stages by outcome.', '# TYPE resume_stage_total counter']
+        for (stage, outcome), count in sorted(outcomes.items()):
+            lines.append(f'resume_stage_total{{stage="{stage}",outcome="{outcome}"}} {count}')
+        lines += ['# HELP resume_stage_input_bytes_total Bytes of PDF input processed per stage.',
+                  '# TYPE resume_stage_input_bytes_total counter']
+        for stage, data in sorted(stages.items()):
+            lines.append(f'resume_stage_input_bytes_total{{stage="{stage}"}} {data["bytes"]}')
+        lines += ['# HELP resume_stage_input_pages_total PDF pages processed per stage.',
+                  '# TYPE resume_stage_input_pages_total counter']
+        for stage, data in sorted(stages.items()):
+            lines.append(f'resume_stage_input_pages_total{{stage="{stage}"}} {data["pages"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path=METRICS_FILE):
+        if not path:
+            return
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+
+registry = MetricsRegistry()
+
+
+class RequestTrace:
+    def __init__(self, registry=registry, profile=None, **fields):
+        # fields (e.g. digest, bytes, pages) go into every stage record and the log line
+        self.registry = registry
+        self.fields = fields
+        self.stages = []
+        self._current = None
+        self._start = time.perf_counter()
+        self._profiler = None
+        if (PROFILE_SLOW_MS > 0) if profile is None else profile:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                self._profiler = profiler
+            except ValueError:
+                # Another analysis in this process is already being profiled
+                pass
+
+    def stage(self, name):
+        # Ends the running stage (if any) and starts timing `name`
+        self._end_stage('ok')
+        self._current = (name, time.perf_counter())
+
+    def _end_stage(self, outcome):
+        if self._current is None:
+            return
+        name, started = self._current
+        self._current = None
+        seconds = time.perf_counter() - started
+        size_bytes = self.fields.get('bytes') or 0
+        pages = self.fields.get('pages') or 0
+        self.stages.append({'stage': name, 'seconds': round(seconds, 6), 'outcome': outcome,
+                            'bytes': size_bytes, 'pages': pages})
+        self.registry.observe(name, seconds, outcome, size_bytes, pages)
+
+    def stop(self, outcome='ok'):
+        # Ends the running stage without finishing the trace
+        self._end_stage(outcome)
+
+    def add_stages(self, stages):
+        # Folds in stage records timed elsewhere (e.g. in a worker process)
+        for record in stages:
+            self.stages.append(record)
+            self.registry.observe(record['stage'], record['seconds'], record['outcome'],
+                                  record.get('bytes', 0), record.get('pages', 0))
+
+    def stop_profile(self):
+        # Stops profiling; returns the saved profile's path if this trace ran past PROFILE_SLOW_MS
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return None
+        profiler.disable()
+        total = time.perf_counter() - self._start
+        if total * 1000 >= PROFILE_SLOW_MS:
+            return _save_profile(profiler, total, self.fields.get('digest'))
+        return None
+
+    def finish(self, outcome='ok'):
+        self._end_stage(outcome)
+        total = time.perf_counter() - self._start
+        self.registry.observe('total', total, outcome, self.fields.get('bytes') or 0, self.fields.get('pages') or 0)
+        record = dict(self.fields, outcome=outcome, seconds=round(total, 6), stages=self.stages)
+        profile = self.stop_profile()
+        if profile:
+            record['profile'] = profile
+        logger.info(json.dumps(record, default=str))
+        try:
+            self.registry.write_textfile()
+        except OSError:
+            logger.warning('Could not write metrics file %s', METRICS_FILE)
+        return record
+
+
+def _save_profile(profiler, seconds, digest=None):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    # The duration leads the name so the slowest profiles sort last
+    name = f"{int(seconds * 1000):09d}ms_{time.strftime('%Y%m%d_%H%M%S')}_{(digest or 'nodigest')[:12]}.prof"
+    path = os.path.join(PROFILE_DIR, name)
+    profiler.dump_stats(path)
+    profiles = sorted(f for f in os.listdir(PROFILE_DIR) if f.endswith('.prof'))
+    for old in profiles[:-PROFILE_KEEP]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, old))
+        except OSError:
+            pass
+    return path if os.path.exists(path) else None
+
+
+def prometheus_text():
+    return registry.prometheus_text()
@@ -0,0 +1,96 @@
+import argparse
+import datetime
+import json
+import sys
+
+from Database import analysis_row, get_database, write_analyses
+
+# --- user_data -> analyses migration ---
+# Usage: python Migrate.py [--batch-size 1000]
+# Copies legacy rows in ID order, one transaction per batch. Each copied row
+# keeps its old ID in analyses.legacy_id, so an interrupted run resumes after
+# the last row it wrote and a finished run is a no-op.
+
+LEGACY_TIMESTAMP_FORMATS = ('%Y-%m-%d_%H:%M:%S', '%Y-%m-%d %H:%M:%S')
+LEGACY_COLUMNS = ('ID', 'Name', 'Email_ID', 'resume_score', 'Timestamp', 'Page_no', 'Predicted_Field',
+                  'User_level', 'Actual_skills', 'Recommended_skills', 'Recommended_courses')
+
+
+def _text(value):
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    return value if value is not None else ''
+
+
+def _list(value):
+    # Legacy list columns are JSON, or str(list) from older versions of the app
+    value = _text(value)
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        parsed = [item.strip(" '\"") for item in value.strip('[]').split(',')]
+    return [item for item in parsed if item] if isinstance(parsed, list) else []
+
+
+def _number(value):
+    try:
+        return int(float(_text(value)))
+    except ValueError:
+        return 0
+
+
+def _timestamp(value):
+    value = _text(value)
+    for fmt in LEGACY_TIMESTAMP_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return datetime.datetime(1970, 1, 1)
+
+
+def legacy_to_row(legacy):
+    row = dict(zip(LEGACY_COLUMNS, legacy))
+    return analysis_row(
+        _text(row['Name']),
+        _text(row['Email_ID']),
+        _number(row['resume_score']),
+        _timestamp(row['Timestamp']),
+        _number(row['Page_no']),
+        _text(row['Predicted_Field']),
+        _text(row['User_level']),
+        _list(row['Actual_skills']),
+        _list(row['Recommended_skills']),
+        _list(row['Recommended_courses']),
+        legacy_id=row['ID'],
+    )
+
+
+def migrate(database, batch_size=1000):
+    last_id = database.query("SELECT MAX(legacy_id) FROM analyses")[0][0] or 0
+    migrated = 0
+    while True:
+        legacy = database.query(f"SELECT {', '.join(LEGACY_COLUMNS)} FROM user_data WHERE ID > %s "
+                                "ORDER BY ID LIMIT %s", (last_id, batch_size))
+        if not legacy:
+            return migrated
+        write_analyses(database, [legacy_to_row(row) for row in legacy])
+        last_id = legacy[-1][0]
+        migrated += len(legacy)
+        print(f'Migrated {migrated} rows (up to user_data.ID {last_id})', file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Copy legacy user_data rows into the analyses tables.')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args(argv)
+    database = get_database()
+    try:
+        print(f'{migrate(database, args.batch_size)} rows migrated')
+    finally:
+        database.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# --- Lazy, process-wide NLP models ---
+# Models are verified once per process and loaded on first use, so Streamlit
+# reruns and batch workers share one spaCy pipeline instead of reloading it.
+# Set RESUME_OFFLINE=1 to refuse downloads and only report what is missing.
+
+SPACY_MODEL = 'en_core_web_sm'
+
+# nltk.download() id -> nltk.data.find() path
+NLTK_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'punkt': 'tokenizers/punkt',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'wordnet': 'corpora/wordnet',
+    'maxent_ne_chunker': 'chunkers/maxent_ne_chunker',
+    'words': 'corpora/words',
+}
+
+OFFLINE = os.environ.get('RESUME_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+_verified = None
+_verify_lock = threading.Lock()
+timings = {}
+
+
+class MissingModelsError(RuntimeError):
+    def __init__(self, missing):
+        super().__init__('Missing NLP models: ' + ', '.join(missing))
+        self.missing = missing
+
+
+def missing_models():
+    import nltk
+    import spacy
+
+    missing = []
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(f'nltk:{name}')
+    if not spacy.util.is_package(SPACY_MODEL):
+        missing.append(f'spacy:{SPACY_MODEL}')
+    return missing
+
+
+def verify_models(offline=None):
+    # Checks (and unless offline, downloads) each model at most once per process
+    global _verified
+    offline = OFFLINE if offline is None else offline
+    with _verify_lock:
+        if _verified is not None:
+            return _verified
+        start = time.perf_counter()
+        missing = missing_models()
+        if missing and not offline:
+            import nltk
+            import spacy
+
+            for item in missing:
+                kind, name = item.split(':', 1)
+                logger.info('Downloading %s', item)
+                if kind == 'nltk':
+                    nltk.download(name, quiet=True)
+                else:
+                    spacy.cli.download(name)
+            missing = missing_models()
+        timings['verify'] = time.perf_counter() - start
+        logger.info('Model verification took %.3fs, missing: %s', timings['verify'], missing or 'none')
+        _verified = missing
+        return missing
+
+
+def _load(name, loader):
+    missing = verify_models()
+    if missing:
+        raise MissingModelsError(missing)
+    start = time.perf_counter()
+    model = loader()
+    timings[name] = time.perf_counter() - start
+    logger.info('Loaded %s in %.3fs', name, timings[name])
+    return model
+
+
+@lru_cache(maxsize=None)
+def get_nlp():
+    import spacy
+    return _load('spacy', lambda: spacy.load(SPACY_MODEL))
+
+
+@lru_cache(maxsize=None)
+def get_custom_nlp():
+    # pyresparser ships its entity model inside the package directory
+    import spacy
+    import pyresparser
+    return _load('pyresparser', lambda: spacy.load(os.path.dirname(os.path.abspath(pyresparser.__file__))))
+
+
+def startup_report():
+    return {
+        'offline': OFFLINE,
+        'missing': verify_models(),
+        'timings': dict(timings),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Verify NLP models and report cold-start time.')
+    parser.add_argument('--offline', action='store_true', help='never download, only report missing models')
+    parser.add_argument('--load', action='store_true', help='also load the spaCy pipelines')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    missing = verify_models(offline=args.offline or None)
+    if args.load and not missing:
+        get_nlp()
+        get_custom_nlp()
+    report = {'offline': args.offline or OFFLINE, 'missing': missing, 'timings': dict(timings),
+              'cold_start': time.perf_counter() - start}
+    print(json.dumps(report, indent=2))
+    return 1 if missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
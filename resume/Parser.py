@@ -0,0 +1,56 @@
+from spacy.matcher import Matcher
+from pyresparser import utils
+
+from Models import get_nlp, get_custom_nlp
+
+# --- Entity extraction over already-extracted text ---
+# Mirrors ResumeParser.get_extracted_data(), but takes the output of
+# Extractor.extract_pdf() instead of re-reading and re-laying out the PDF.
+
+
+def parse_resume(extracted, skills_file=None, custom_regex=None):
+    nlp = get_nlp()
+    custom_nlp = get_custom_nlp()
+    text_raw = extracted['text']
+    text = ' '.join(text_raw.split())
+    doc = nlp(text)
+    custom_doc = custom_nlp(text_raw)
+    noun_chunks = list(doc.noun_chunks)
+
+    details = {
+        'name': None,
+        'email': None,
+        'mobile_number': None,
+        'skills': None,
+        'college_name': None,
+        'degree': None,
+        'designation': None,
+        'experience': None,
+        'company_names': None,
+        'no_of_pages': None,
+        'total_experience': None,
+    }
+
+    cust_ent = utils.extract_entities_wih_custom_model(custom_doc)
+    entities = utils.extract_entity_sections_grad(text_raw)
+    try:
+        details['name'] = cust_ent['Name'][0]
+    except (IndexError, KeyError):
+        details['name'] = utils.extract_name(doc, matcher=Matcher(nlp.vocab))
+    details['email'] = utils.extract_email(text)
+    details['mobile_number'] = utils.extract_mobile_number(text, custom_regex)
+    details['skills'] = utils.extract_skills(doc, noun_chunks, skills_file)
+    details['college_name'] = entities.get('College Name')
+    details['degree'] = cust_ent.get('Degree')
+    details['designation'] = cust_ent.get('Designation')
+    details['company_names'] = cust_ent.get('Companies worked at')
+    if 'experience' in entities:
+        details['experience'] = entities['experience']
+        try:
+            details['total_experience'] = round(utils.get_total_experience(entities['experience']) / 12, 2)
+        except KeyError:
+            details['total_experience'] = 0
+    else:
+        details['total_experience'] = 0
+    details['no_of_pages'] = extracted['page_count']
+    return details
@@ -0,0 +1,131 @@
+import base64
+import os
+import shutil
+import threading
+import time
+
+# --- Lightweight PDF preview ---
+# Preference order:
+#   1. PNG thumbnails of the first pages, rendered once per file hash (needs PyMuPDF)
+#   2. the PDF served by URL from Streamlit's static folder (server.enableStaticServing)
+#   3. the old inline base64 iframe, only for files under PREVIEW_MAX_INLINE_BYTES
+# Anything else gets no preview rather than a multi-megabyte websocket message.
+# Thumbnail folders and static copies are kept per file hash; ones not shown for
+# PREVIEW_RETENTION seconds, or beyond the newest PREVIEW_MAX_ENTRIES, are removed.
+
+PREVIEW_DIR = os.environ.get('RESUME_PREVIEW_DIR', './Previews')
+PREVIEW_PAGES = int(os.environ.get('RESUME_PREVIEW_PAGES', 2))
+PREVIEW_ZOOM = float(os.environ.get('RESUME_PREVIEW_ZOOM', 1.0))
+PREVIEW_MAX_INLINE_BYTES = int(os.environ.get('RESUME_PREVIEW_MAX_INLINE_BYTES', 512 * 1024))
+# Set to Streamlit's ./static folder to serve PDFs by URL instead of inlining them
+PREVIEW_STATIC_DIR = os.environ.get('RESUME_PREVIEW_STATIC_DIR')
+PREVIEW_RETENTION = float(os.environ.get('RESUME_PREVIEW_RETENTION', 24 * 3600))
+PREVIEW_MAX_ENTRIES = int(os.environ.get('RESUME_PREVIEW_MAX_ENTRIES', 500))
+PRUNE_INTERVAL = 300
+
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+
+def thumbnails_available():
+    try:
+        import fitz  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def render_thumbnails(path, digest, max_pages=PREVIEW_PAGES, zoom=PREVIEW_ZOOM):
+    # Returns PNG paths for the first pages, rendering only what is not cached yet
+    out_dir = os.path.join(PREVIEW_DIR, digest)
+    cached = sorted(f for f in os.listdir(out_dir) if f.endswith('.png')) if os.path.isdir(out_dir) else []
+    if cached and os.path.exists(os.path.join(out_dir, 'complete')):
+        # Touch the folder so retention follows last use
+        os.utime(out_dir)
+        return [os.path.join(out_dir, f) for f in cached[:max_pages]]
+
+    import fitz
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    with fitz.open(path) as doc:
+        for page_no in range(min(max_pages, doc.page_count)):
+            png_path = os.path.join(out_dir, f'page_{page_no + 1:03d}.png')
+            if not os.path.exists(png_path):
+                pixmap = doc[page_no].get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+                pixmap.save(png_path + '.tmp.png')
+                os.replace(png_path + '.tmp.png', png_path)
+            paths.append(png_path)
+    open(os.path.join(out_dir, 'complete'), 'w').close()
+    return paths
+
+
+def static_url(path, digest):
+    # Links (or copies) the PDF into the static folder under its hash
+    os.makedirs(PREVIEW_STATIC_DIR, exist_ok=True)
+    name = f'{digest}.pdf'
+    target = os.path.join(PREVIEW_STATIC_DIR, name)
+    if os.path.exists(target):
+        os.utime(target)
+    else:
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copyfile(path, target)
+    return f'app/static/{name}'
+
+
+def _entries(directory, is_entry):
+    # (mtime, path) of preview entries in directory, oldest first
+    if not directory or not os.path.isdir(directory):
+        return []
+    entries = []
+    for entry in os.scandir(directory):
+        if is_entry(entry):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                pass
+    return sorted(entries)
+
+
+def _remove(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def prune_previews(force=False):
+    # At most once per PRUNE_INTERVAL unless forced
+    global _last_prune
+    now = time.time()
+    with _prune_lock:
+        if not force and now - _last_prune < PRUNE_INTERVAL:
+            return
+        _last_prune = now
+    for entries in (_entries(PREVIEW_DIR, lambda e: e.is_dir()),
+                    _entries(PREVIEW_STATIC_DIR, lambda e: e.is_file() and e.name.endswith('.pdf'))):
+        excess = len(entries) - PREVIEW_MAX_ENTRIES
+        for idx, (mtime, path) in enumerate(entries):
+            if idx < excess or now - mtime > PREVIEW_RETENTION:
+                _remove(path)
+
+
+def preview_plan(path, digest):
+    # Returns (mode, payload) describing how to show the PDF
+    prune_previews()
+    if thumbnails_available():
+        try:
+            return 'thumbnails', render_thumbnails(path, digest)
+        except Exception:
+            pass
+    if PREVIEW_STATIC_DIR:
+        return 'url', static_url(path, digest)
+    size = os.path.getsize(path)
+    if size <= PREVIEW_MAX_INLINE_BYTES:
+        with open(path, 'rb') as f:
+            return 'inline', base64.b64encode(f.read()).decode('utf-8')
+    return 'none', size
@@ -0,0 +1,127 @@
+import heapq
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from Database import get_database, get_insert_queue, normalize_skill
+
+# --- Candidate search ---
+# An in-memory inverted index from normalized skill to analysis IDs, plus
+# ID sets per predicted field and level. Queries are set intersections and
+# unions starting from the smallest posting, so they cost roughly the size of
+# the rarest term rather than the table. The index is loaded from
+# analysis_skills once, updated by the insert queue as batches commit, and
+# caught up (ID > last loaded ID) before each search for rows written by
+# other processes such as Migrate.py.
+
+SEARCH_LOAD_BATCH = 10000
+FACET_COLUMNS = ('Predicted_Field', 'User_level')
+_EMPTY = frozenset()
+
+
+class SkillIndex:
+    def __init__(self, database):
+        self.database = database
+        self.loaded_id = 0  # highest analyses.ID read from the database
+        self._postings = defaultdict(set)
+        self._display = {}
+        self._facets = {column: defaultdict(set) for column in FACET_COLUMNS}
+        self._ids = set()
+        self._max_id = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def _add(self, analysis_id, field, level, skills):
+        # skills are (normalized, display name) pairs; re-adding an ID is harmless
+        self._ids.add(analysis_id)
+        self._max_id = max(self._max_id, analysis_id)
+        self._facets['Predicted_Field'][field].add(analysis_id)
+        self._facets['User_level'][level].add(analysis_id)
+        for skill, display_name in skills:
+            self._postings[skill].add(analysis_id)
+            self._display.setdefault(skill, display_name)
+
+    def add_rows(self, rows):
+        # Insert queue listener; rows are analysis_row() dicts with their new 'id'
+        with self._lock:
+            for row in rows:
+                skills = [(normalize_skill(s), str(s).strip()[:200]) for s in row['skills']]
+                self._add(row['id'], row['predicted_field'], row['user_level'], [s for s in skills if s[0]])
+
+    def refresh(self, batch_size=SEARCH_LOAD_BATCH):
+        # Reads analyses added since the last refresh, in keyset batches
+        with self._refresh_lock:
+            while True:
+                rows = self.database.query("SELECT ID, predicted_field, user_level FROM analyses "
+                                           "WHERE ID > %s ORDER BY ID LIMIT %s", (self.loaded_id, batch_size))
+                if not rows:
+                    return
+                first_id, last_id = rows[0][0], rows[-1][0]
+                skills = defaultdict(list)
+                for analysis_id, skill, display_name in self.database.query(
+                        "SELECT analysis_id, skill, display_name FROM analysis_skills "
+                        "WHERE analysis_id >= %s AND analysis_id <= %s", (first_id, last_id)):
+                    skills[analysis_id].append((skill, display_name))
+                with self._lock:
+                    for analysis_id, field, level in rows:
+                        self._add(analysis_id, field, level, skills.get(analysis_id, ()))
+                self.loaded_id = last_id
+                if len(rows) < batch_size:
+                    return
+
+    def vocabulary(self):
+        # Display names of every indexed skill, most common first
+        with self._lock:
+            ranked = sorted(self._postings.items(), key=lambda item: (-len(item[1]), item[0]))
+            return [self._display[skill] for skill, _ in ranked]
+
+    def search(self, all_skills=(), any_skills=(), field=None, level=None, limit=50):
+        # Candidates having every skill in all_skills and at least one in
+        # any_skills, optionally in one field/level. Returns the newest `limit`
+        # IDs, the total match count and field/level facet counts.
+        self.refresh()
+        with self._lock:
+            terms = [self._postings.get(normalize_skill(s), _EMPTY) for s in all_skills]
+            if field:
+                terms.append(self._facets['Predicted_Field'].get(field, _EMPTY))
+            if level:
+                terms.append(self._facets['User_level'].get(level, _EMPTY))
+            if any_skills:
+                terms.append(set().union(*(self._postings.get(normalize_skill(s), _EMPTY) for s in any_skills)))
+            if terms:
+                terms.sort(key=len)
+                matches = terms[0].intersection(*terms[1:])
+            else:
+                matches = self._ids
+            facets = {}
+            for column, values in self._facets.items():
+                counts = {value: (len(ids) if matches is self._ids else len(matches.intersection(ids)))
+                          for value, ids in values.items()}
+                facets[column] = sorted(((v, c) for v, c in counts.items() if c), key=lambda item: -item[1])
+            return {
+                'ids': self._newest(matches, limit),
+                'total': len(matches),
+                'facets': facets,
+            }
+
+    def _newest(self, matches, limit):
+        if limit <= 0:
+            return []
+        if len(matches) <= limit * 100:
+            return heapq.nlargest(limit, matches)
+        # Large result sets: IDs are autoincrement, so walking down from the
+        # newest ID takes about limit * max_id / len(matches) set lookups
+        newest = []
+        for analysis_id in range(self._max_id, 0, -1):
+            if analysis_id in matches:
+                newest.append(analysis_id)
+                if len(newest) == limit:
+                    break
+        return newest
+
+
+@lru_cache(maxsize=None)
+def get_skill_index():
+    index = SkillIndex(get_database())
+    get_insert_queue().add_listener(index.add_rows)
+    return index
@@ -0,0 +1,67 @@
+import re
+
+# --- Section-rule engine for resume scoring ---
+# Every heading (with its synonyms) is compiled into one case-insensitive
+# pattern, so a resume is scanned once regardless of how many rules exist.
+# Only headings count: the word has to start a line and end it, or be followed
+# by a colon, so prose that merely mentions 'a project' or 'interests' does not.
+
+# (section, headings that count for it, points)
+SECTION_RULES = [
+    ('Objective', ['Objective', 'Career Objective', 'Professional Summary', 'Career Summary'], 20),
+    ('Declaration', ['Declaration'], 20),
+    ('Hobbies/Interests', ['Hobbies', 'Interests', 'Extracurricular Activities'], 20),
+    ('Achievements', ['Achievements', 'Accomplishments', 'Awards'], 20),
+    ('Projects', ['Projects', 'Academic Projects', 'Personal Projects'], 20),
+]
+
+
+def _variants(heading):
+    # Singular and plural forms, so 'Project' and 'Objectives' count as well
+    if heading.lower().endswith('ies'):
+        return [heading, heading[:-3] + 'y']
+    if heading.lower().endswith('s'):
+        return [heading, heading[:-1]]
+    return [heading, heading + 's']
+
+
+class SectionScorer:
+    def __init__(self, rules=SECTION_RULES):
+        self.rules = list(rules)
+        alternatives = []
+        for idx, (_, headings, _) in enumerate(self.rules):
+            # Longest first so 'Career Objective' wins over 'Objective' at the same spot
+            terms = sorted({v for h in headings for v in _variants(h)}, key=len, reverse=True)
+            body = '|'.join(r'\s+'.join(map(re.escape, h.split())) for h in terms)
+            alternatives.append(f'(?P<s{idx}>{body})')
+        self.pattern = re.compile(r'^[^\S\n]*(?:' + '|'.join(alternatives) + r')[^\S\n]*(?::|$)',
+                                  re.IGNORECASE | re.MULTILINE)
+
+    def detect(self, text):
+        # Returns {section: [start offsets]} for every section present
+        found = {}
+        for match in self.pattern.finditer(text or ''):
+            section = self.rules[int(match.lastgroup[1:])][0]
+            found.setdefault(section, []).append(match.start(match.lastgroup))
+        return found
+
+    def score(self, text):
+        found = self.detect(text)
+        sections = {section: section in found for section, _, _ in self.rules}
+        score = sum(points for section, _, points in self.rules if sections[section])
+        positions = {section: offsets[0] for section, offsets in found.items()}
+        return score, sections, positions
+
+    def score_batch(self, texts):
+        return [self.score(text) for text in texts]
+
+
+default_scorer = SectionScorer()
+
+
+def score_resume(resume_text):
+    return default_scorer.score(resume_text)
+
+
+def score_batch(texts):
+    return default_scorer.score_batch(texts)
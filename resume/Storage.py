@@ -0,0 +1,152 @@
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# --- Content-addressed upload store ---
+# Uploads are streamed to disk in chunks while being hashed and stored as
+# <root>/<first two hex digits>/<sha256>.pdf, so the same file is kept once and
+# uploads with the same name never overwrite each other. The store enforces a
+# per-file and a total size limit: files past the retention period go first,
+# then the least recently uploaded ones. Only files in that layout are ever
+# removed, and files younger than UPLOAD_MIN_AGE are never evicted, since an
+# analysis job may still be reading them.
+
+UPLOAD_DIR = os.environ.get('RESUME_UPLOAD_DIR', './Uploaded_Resumes')
+UPLOAD_MAX_FILE_BYTES = int(os.environ.get('RESUME_UPLOAD_MAX_FILE_BYTES', 10 * 1024 * 1024))
+UPLOAD_MAX_TOTAL_BYTES = int(os.environ.get('RESUME_UPLOAD_MAX_TOTAL_BYTES', 1024 * 1024 * 1024))
+UPLOAD_RETENTION = float(os.environ.get('RESUME_UPLOAD_RETENTION', 7 * 24 * 3600))
+UPLOAD_MIN_AGE = float(os.environ.get('RESUME_UPLOAD_MIN_AGE', 600))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+RETENTION_SWEEP_INTERVAL = 300
+_SHARD_NAME = re.compile(r'^[0-9a-f]{2}$')
+_STORED_NAME = re.compile(r'^([0-9a-f]{64})\.pdf$')
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UploadStoreFull(Exception):
+    pass
+
+
+class StoredUpload:
+    def __init__(self, path, digest, size, existed):
+        self.path = path
+        self.digest = digest
+        self.size = size
+        self.existed = existed  # True when identical bytes were already stored
+
+
+class UploadStore:
+    def __init__(self, root=UPLOAD_DIR, max_file_bytes=UPLOAD_MAX_FILE_BYTES, max_total_bytes=UPLOAD_MAX_TOTAL_BYTES,
+                 retention=UPLOAD_RETENTION, min_age=UPLOAD_MIN_AGE):
+        self.root = root
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.retention = retention
+        self.min_age = min_age
+        self._tmp_dir = os.path.join(root, '.incoming')
+        os.makedirs(self._tmp_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._total_bytes = None  # counted on first use
+        self._last_sweep = 0.0
+
+    def path_for(self, digest):
+        return os.path.join(self.root, digest[:2], digest + '.pdf')
+
+    def save(self, source, size_hint=None):
+        # source is a file-like object (e.g. Streamlit's UploadedFile); returns a StoredUpload
+        if size_hint is not None and size_hint > self.max_file_bytes:
+            raise UploadTooLarge(f'{size_hint} bytes is over the {self.max_file_bytes} byte limit')
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        sha = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp_dir, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                while True:
+                    chunk = source.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_file_bytes:
+                        raise UploadTooLarge(f'Upload is over the {self.max_file_bytes} byte limit')
+                    sha.update(chunk)
+                    f.write(chunk)
+            digest = sha.hexdigest()
+            path = self.path_for(digest)
+            with self._lock:
+                if os.path.exists(path):
+                    # Already stored: refresh its age instead of writing a copy
+                    os.utime(path)
+                    return StoredUpload(path, digest, size, existed=True)
+                self._make_room(size)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+                self._total_bytes += size
+            return StoredUpload(path, digest, size, existed=False)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _files(self):
+        # (mtime, size, path) of every <xx>/<sha256>.pdf, oldest first; anything
+        # else under root (e.g. the sample resumes) is never counted or evicted
+        files = []
+        for shard in os.scandir(self.root):
+            if not (shard.is_dir() and _SHARD_NAME.match(shard.name)):
+                continue
+            for entry in os.scandir(shard.path):
+                match = _STORED_NAME.match(entry.name)
+                if not match or not match.group(1).startswith(shard.name):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(files)
+
+    def _remove(self, path, size):
+        try:
+            os.remove(path)
+            self._total_bytes -= size
+        except OSError:
+            pass
+
+    def _make_room(self, incoming):
+        # Called with the lock held
+        now = time.time()
+        sweep = now - self._last_sweep >= RETENTION_SWEEP_INTERVAL
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._files())
+        if not sweep and self._total_bytes + incoming <= self.max_total_bytes:
+            return
+        self._last_sweep = now
+        for mtime, size, path in self._files():
+            if now - mtime < self.min_age:
+                break
+            if now - mtime > self.retention or self._total_bytes + incoming > self.max_total_bytes:
+                self._remove(path, size)
+        if self._total_bytes + incoming > self.max_total_bytes:
+            raise UploadStoreFull(f'Upload storage is full ({self._total_bytes} of {self.max_total_bytes} bytes)')
+
+    def usage(self):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._files())
+            return {'bytes': self._total_bytes, 'max_bytes': self.max_total_bytes}
+
+
+@lru_cache(maxsize=None)
+def get_upload_store():
+    return UploadStore()
@@ -0,0 +1,58 @@
+from Courses import ds_course, web_course, android_course, ios_course, uiux_course
+
+# Career fields used for prediction and recommendations.
+# keywords: a keyword, or (keyword, weight) for terms that are weak evidence on
+# their own; skills: recommended skills shown to the candidate; courses: from Courses.py
+
+fields = [
+    {
+        'name': 'Data Science',
+        'keywords': ['tensorflow', 'keras', 'pytorch', 'machine learning', 'deep learning',
+                     ('flask', 0.5), ('streamlit', 0.5), 'scikit-learn', 'sklearn', 'data science',
+                     ('pandas', 0.5), ('numpy', 0.5), 'data mining', 'data visualization'],
+        'skills': ['Data Visualization', 'Predictive Analysis', 'Statistical Modeling', 'Data Mining',
+                   'Clustering & Classification', 'Data Analytics', 'Quantitative Analysis', 'Web Scraping',
+                   'ML Algorithms', 'Keras', 'Pytorch', 'Probability', 'Scikit-learn', 'Tensorflow',
+                   'Flask', 'Streamlit'],
+        'courses': ds_course,
+    },
+    {
+        'name': 'Web Development',
+        'keywords': ['react', 'django', 'node js', 'node.js', 'nodejs', 'react js', 'react.js', 'php', 'laravel',
+                     'magento', 'wordpress', 'javascript', 'angular js', 'angularjs', 'angular', ('c#', 0.5),
+                     ('flask', 0.5), 'html', 'css', 'web development'],
+        'skills': ['React', 'Django', 'Node JS', 'React JS', 'PHP', 'Laravel', 'Magento', 'WordPress',
+                   'JavaScript', 'Angular JS', 'C#', 'Flask', 'SDK'],
+        'courses': web_course,
+    },
+    {
+        'name': 'Android Development',
+        'keywords': ['android', 'android development', 'flutter', 'kotlin', ('xml', 0.5), 'kivy',
+                     'android studio'],
+        'skills': ['Android', 'Android Development', 'Flutter', 'Kotlin', 'XML', 'Java', 'Kivy', 'GIT',
+                   'SDK', 'SQLite'],
+        'courses': android_course,
+    },
+    {
+        'name': 'IOS Development',
+        'keywords': ['ios', 'ios development', 'swift', 'cocoa', 'cocoa touch', 'xcode', 'objective-c',
+                     'swiftui'],
+        'skills': ['IOS', 'IOS Development', 'Swift', 'Cocoa', 'Cocoa Touch', 'Xcode',
+                   'Objective-C', 'SQLite', 'Plist', 'StoreKit', 'UI-Kit', 'AV Foundation',
+                   'Auto-Layout'],
+        'courses': ios_course,
+    },
+    {
+        'name': 'UI-UX Development',
+        'keywords': ['ux', 'adobe xd', 'figma', 'zeplin', 'balsamiq', 'ui', 'prototyping', 'wireframes',
+                     'storyframes', 'adobe photoshop', ('photoshop', 0.5), ('editing', 0.25), 'adobe illustrator',
+                     ('illustrator', 0.5), 'adobe after effects', ('after effects', 0.5), 'adobe premier pro',
+                     ('premier pro', 0.5), 'adobe indesign', ('indesign', 0.5), 'wireframe', ('solid', 0.25),
+                     ('grasp', 0.25), 'user research', 'user experience', 'ui/ux'],
+        'skills': ['UI', 'User Experience', 'Adobe XD', 'Figma', 'Zeplin', 'Balsamiq',
+                   'Prototyping', 'Wireframes', 'Storyframes', 'Adobe Photoshop',
+                   'Editing', 'Illustrator', 'After Effects', 'Premier Pro', 'Indesign',
+                   'Wireframe', 'Solid', 'Grasp', 'User Research'],
+        'courses': uiux_course,
+    },
+]
@@ -0,0 +1,118 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from Courses import resume_videos, interview_videos
+
+logger = logging.getLogger(__name__)
+
+# --- Offline video metadata catalog ---
+# Titles and durations are fetched ahead of time with `python Videos.py --refresh`
+# and read from disk at runtime, so rendering never waits on yt_dlp or the network.
+
+CATALOG_PATH = os.environ.get('RESUME_VIDEO_CATALOG', './video_catalog.json')
+# How long the in-memory copy is trusted before the file is checked again
+CATALOG_TTL = float(os.environ.get('RESUME_VIDEO_CATALOG_TTL', 300))
+# Entries older than this are refetched by --refresh
+CATALOG_MAX_AGE = float(os.environ.get('RESUME_VIDEO_CATALOG_MAX_AGE', 7 * 24 * 3600))
+FALLBACK_TITLE = 'Watch this video'
+
+_catalog = {}
+_loaded_at = 0.0
+_loaded_mtime = None
+_lock = threading.Lock()
+
+
+def load_catalog(path=CATALOG_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        logger.warning('Could not read video catalog %s', path)
+        return {}
+
+
+def get_catalog(path=CATALOG_PATH):
+    global _catalog, _loaded_at, _loaded_mtime
+    with _lock:
+        now = time.monotonic()
+        if _loaded_at and now - _loaded_at < CATALOG_TTL:
+            return _catalog
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        if mtime != _loaded_mtime or not _loaded_at:
+            _catalog = load_catalog(path)
+            _loaded_mtime = mtime
+        _loaded_at = now
+        return _catalog
+
+
+def video_info(link):
+    return get_catalog().get(link, {})
+
+
+def video_title(link, fallback=FALLBACK_TITLE):
+    return video_info(link).get('title') or fallback
+
+
+def fetch_metadata(link):
+    from yt_dlp import YoutubeDL
+    with YoutubeDL({'quiet': True, 'skip_download': True}) as ydl:
+        info = ydl.extract_info(link, download=False)
+    return {
+        'title': info.get('title'),
+        'duration': info.get('duration'),
+        'channel': info.get('channel') or info.get('uploader'),
+        'fetched_at': time.time(),
+    }
+
+
+def refresh_catalog(links, path=CATALOG_PATH, force=False):
+    catalog = load_catalog(path)
+    now = time.time()
+    updated = failed = 0
+    for link in dict.fromkeys(links):
+        entry = catalog.get(link)
+        if entry and not force and now - entry.get('fetched_at', 0) < CATALOG_MAX_AGE:
+            continue
+        try:
+            catalog[link] = fetch_metadata(link)
+            updated += 1
+        except Exception as e:
+            # Keep whatever we had before; rendering falls back to a generic title
+            logger.warning('Could not fetch %s: %s', link, e)
+            failed += 1
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+    return {'updated': updated, 'failed': failed, 'total': len(catalog)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the offline video metadata catalog.')
+    parser.add_argument('--refresh', action='store_true', help='fetch missing or stale entries')
+    parser.add_argument('--force', action='store_true', help='refetch every entry')
+    parser.add_argument('--catalog', default=CATALOG_PATH)
+    args = parser.parse_args(argv)
+
+    if not (args.refresh or args.force):
+        catalog = load_catalog(args.catalog)
+        print(json.dumps({'total': len(catalog), 'path': args.catalog}))
+        return 0
+    logging.basicConfig(level=logging.INFO)
+    summary = refresh_catalog(resume_videos + interview_videos, path=args.catalog, force=args.force)
+    print(json.dumps(summary))
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
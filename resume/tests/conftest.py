@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# The app's modules import each other by bare name from the resume directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Database import Database  # noqa: E402
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = Database(backend='sqlite', sqlite_path=str(tmp_path / 'test.db'))
+    db.ensure_schema()
+    yield db
+    db.close()
@@ -0,0 +1,19 @@
+import pytest
+
+# Analyzer pulls in the PDF and NLP stack through Extractor and Parser
+pytest.importorskip('pdfminer3')
+pytest.importorskip('spacy')
+
+from Analyzer import FIELD_MIN_SCORE, recommend_field  # noqa: E402
+
+
+def test_keywords_pick_the_field():
+    field, skills, scores = recommend_field('Built models with TensorFlow and scikit-learn', [])
+    assert field == 'Data Science' and skills
+    assert scores['Data Science'] >= FIELD_MIN_SCORE
+
+
+def test_weak_keywords_alone_do_not_pick_a_field():
+    field, skills, scores = recommend_field('Worked at Solid Grasp Editing Ltd', [])
+    assert (field, skills) == ('', [])
+    assert 0 < scores['UI-UX Development'] < FIELD_MIN_SCORE
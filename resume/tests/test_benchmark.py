@@ -0,0 +1,17 @@
+import os
+
+from Benchmark import build_corpus
+
+
+def test_corpus_is_reproducible(tmp_path):
+    first = build_corpus(3, 42, str(tmp_path))
+    again = build_corpus(3, 42, str(tmp_path))
+    assert [d['text'] for d in first] == [d['text'] for d in again]
+    assert [d['path'] for d in first] == [d['path'] for d in again]
+
+
+def test_pdfs_are_not_shared_between_seeds(tmp_path):
+    seed_42 = build_corpus(3, 42, str(tmp_path))
+    seed_7 = build_corpus(3, 7, str(tmp_path))
+    assert not {d['path'] for d in seed_42} & {d['path'] for d in seed_7}
+    assert all(os.path.exists(d['path']) for d in seed_42 + seed_7)
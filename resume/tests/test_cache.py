@@ -0,0 +1,34 @@
+import os
+import time
+
+from Cache import AnalysisCache
+
+
+def test_round_trip_through_disk(tmp_path):
+    AnalysisCache(str(tmp_path), version='v1').put('a' * 64, {'resume_score': 60})
+    assert AnalysisCache(str(tmp_path), version='v1').get('a' * 64)['resume_score'] == 60
+
+
+def test_other_versions_are_missing(tmp_path):
+    AnalysisCache(str(tmp_path), version='v1').put('a' * 64, {'resume_score': 60})
+    assert AnalysisCache(str(tmp_path), version='v2').get('a' * 64) is None
+    assert AnalysisCache(None, version='v2').get('a' * 64) is None
+
+
+def test_memory_keeps_recently_used(tmp_path):
+    cache = AnalysisCache(None, max_memory_entries=2)
+    cache.put('a', {'n': 1})
+    cache.put('b', {'n': 2})
+    cache.get('a')
+    cache.put('c', {'n': 3})
+    assert cache.get('b') is None
+    assert cache.get('a') == {'n': 1} and cache.get('c') == {'n': 3}
+
+
+def test_disk_evicts_least_recently_used(tmp_path):
+    cache = AnalysisCache(str(tmp_path), max_disk_entries=2)
+    for n, digest in enumerate('abc'):
+        cache.put(digest, {'n': n})
+        past = time.time() - 100 + n
+        os.utime(tmp_path / f'{digest}.json', (past, past))
+    assert sorted(os.listdir(tmp_path)) == ['b.json', 'c.json']
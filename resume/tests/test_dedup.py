@@ -0,0 +1,58 @@
+import csv
+import datetime
+
+from Database import analysis_row, write_analyses
+from Dedup import DuplicateIndex, minhash, pack_signature, similarity, store_signatures, unpack_signature, write_report
+
+BASE = ' '.join(f'word{i}' for i in range(300))
+
+
+def test_minhash_estimates_similarity():
+    edited = BASE.replace('word150', 'changed')
+    other = ' '.join(f'other{i}' for i in range(300))
+    assert similarity(minhash(BASE), minhash(BASE)) == 1.0
+    assert similarity(minhash(BASE), minhash(edited)) > 0.85
+    assert similarity(minhash(BASE), minhash(other)) < 0.1
+    assert minhash('') is None
+
+
+def test_signature_round_trip():
+    signature = minhash(BASE)
+    assert unpack_signature(pack_signature(signature)) == signature
+
+
+def store(database, text, digest):
+    row = analysis_row('Name', 'name@example.com', 50, datetime.datetime(2024, 1, 1), 1,
+                       'Web Development', 'Fresher', ['python'], [], [])
+    row.update(digest=digest, signature=minhash(text))
+    write_analyses(database, [row])
+    store_signatures([row], database)
+    return row['id']
+
+
+def test_find_and_find_digest(database):
+    first = store(database, BASE, 'a' * 64)
+    index = DuplicateIndex(database)
+    match = index.find(minhash(BASE.replace('word10 ', '')))
+    assert match['analysis_id'] == first and match['digest'] == 'a' * 64
+    assert index.find(minhash(' '.join(f'other{i}' for i in range(300)))) is None
+    assert index.find_digest('a' * 64) == first
+    assert index.find_digest('b' * 64) is None
+
+
+def test_report_groups_near_duplicates(database, tmp_path):
+    first = store(database, BASE, 'a' * 64)
+    second = store(database, BASE.replace('word20', 'edited'), 'b' * 64)
+    store(database, ' '.join(f'other{i}' for i in range(300)), 'c' * 64)
+    path = tmp_path / 'report.csv'
+    assert write_report(database, str(path)) == {'groups': 1, 'duplicates': 1}
+    rows = list(csv.DictReader(open(path, encoding='utf-8')))
+    assert [(int(r['ID']), r['duplicate_of']) for r in rows] == [(first, ''), (second, str(first))]
+
+
+def test_failed_lookup_is_not_a_match():
+    class Broken:
+        def query(self, *args):
+            raise OSError('database is down')
+
+    assert DuplicateIndex(Broken()).lookup(minhash(BASE)) is None
@@ -0,0 +1,70 @@
+import datetime
+import json
+
+import Database
+from Database import InsertQueue, analysis_row
+
+
+def row(name):
+    return analysis_row(name, f'{name}@example.com', 50, datetime.datetime(2024, 1, 1), 1,
+                        'Data Science', 'Fresher', ['Python'], [], [])
+
+
+def names(database):
+    return [r[0] for r in database.query("SELECT name FROM analyses ORDER BY ID")]
+
+
+def flaky_writes(monkeypatch, failures):
+    # write_analyses fails `failures` times, then writes normally
+    real = Database.write_analyses
+    calls = {'n': 0}
+
+    def write(database, rows):
+        calls['n'] += 1
+        if calls['n'] <= failures:
+            raise OSError('database is down')
+        return real(database, rows)
+    monkeypatch.setattr(Database, 'write_analyses', write)
+
+
+def test_batches_are_written_and_reported(database, tmp_path):
+    written = []
+    queue = InsertQueue(database, batch_size=2, flush_interval=0.01, spill_path=str(tmp_path / 'spill.jsonl'))
+    queue.add_listener(written.extend)
+    for name in ('a', 'b', 'c'):
+        queue.put(row(name))
+    assert queue.flush(5)
+    queue.close()
+    assert names(database) == ['a', 'b', 'c']
+    assert [r['name'] for r in written] == ['a', 'b', 'c'] and all(r['id'] for r in written)
+
+
+def test_failed_batch_is_retried(database, tmp_path, monkeypatch):
+    flaky_writes(monkeypatch, failures=2)
+    queue = InsertQueue(database, flush_interval=0.01, retries=2, retry_backoff=0.01,
+                        spill_path=str(tmp_path / 'spill.jsonl'))
+    queue.put(row('a'))
+    assert queue.flush(5)
+    queue.close()
+    assert names(database) == ['a']
+    assert not (tmp_path / 'spill.jsonl').exists()
+
+
+def test_spilled_rows_are_replayed(database, tmp_path, monkeypatch):
+    spill = tmp_path / 'spill.jsonl'
+    flaky_writes(monkeypatch, failures=2)
+    queue = InsertQueue(database, flush_interval=0.01, retries=1, retry_backoff=0.01, spill_path=str(spill))
+    queue.put(row('a'))
+    assert queue.flush(5)
+    queue.close()
+    assert names(database) == []
+    assert [json.loads(line)['name'] for line in spill.read_text().splitlines()] == ['a']
+
+    # The next writer (e.g. after a restart) writes the spilled rows first
+    replayed = []
+    queue = InsertQueue(database, flush_interval=0.01, spill_path=str(spill))
+    queue.add_listener(replayed.extend)
+    assert queue.flush(5)
+    queue.close()
+    assert names(database) == ['a'] and [r['name'] for r in replayed] == ['a']
+    assert not spill.exists()
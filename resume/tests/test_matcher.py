@@ -0,0 +1,41 @@
+import random
+import re
+
+from Matcher import KeywordMatcher, normalize_text
+
+
+def matcher(keywords):
+    m = KeywordMatcher()
+    for keyword in keywords:
+        m.add(keyword, keyword)
+    return m
+
+
+def regex_matches(keywords, text):
+    text = normalize_text(text)
+    found = set()
+    for keyword in keywords:
+        for match in re.finditer(rf'(?<!\w){re.escape(keyword)}(?!\w)', text):
+            found.add((match.start(), match.end(), keyword))
+    return found
+
+
+def test_whole_words_only():
+    m = matcher(['ui', 'react', 'machine learning'])
+    found = [value for _, _, value in m.find_all('Built UI in React; studied Machine  Learning and guidance')]
+    assert sorted(found) == ['machine learning', 'react', 'ui']
+
+
+def test_overlapping_keywords():
+    m = matcher(['c', 'c++', 'objective c'])
+    assert {value for _, _, value in m.find_all('Objective C and C++')} == {'c', 'c++', 'objective c'}
+
+
+def test_agrees_with_regex():
+    rng = random.Random(7)
+    words = ['java', 'javascript', 'script', 'sql', 'mysql', 'node', 'node.js', 'go', 'c#', 'a']
+    keywords = words[:8]
+    m = matcher(keywords)
+    for _ in range(200):
+        text = ' '.join(rng.choice(words + ['xjava', 'sqlx', '-', ',']) for _ in range(rng.randint(0, 12)))
+        assert set(m.find_all(text)) == regex_matches(keywords, text)
@@ -0,0 +1,30 @@
+import json
+
+from Migrate import migrate
+
+
+def add_legacy(database, count, start=0):
+    database.executemany(
+        "INSERT INTO user_data (Name, Email_ID, resume_score, Timestamp, Page_no, Predicted_Field, User_level, "
+        "Actual_skills, Recommended_skills, Recommended_courses) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+        [(f'User {i}', f'user{i}@example.com', '42', '2021-03-04_05:06:07', '2', 'Data Science', 'Fresher',
+          str(['Python', 'SQL']) if i % 2 else json.dumps(['Python', 'SQL']), '[]', '[]')
+         for i in range(start, start + count)])
+
+
+def test_copies_legacy_rows(database):
+    add_legacy(database, 3)
+    assert migrate(database, batch_size=2) == 3
+    rows = database.query("SELECT legacy_id, name, resume_score, created_at, page_count FROM analyses ORDER BY ID")
+    assert rows == [(i + 1, f'User {i}', 42, '2021-03-04 05:06:07', 2) for i in range(3)]
+    skills = database.query("SELECT analysis_id, skill FROM analysis_skills ORDER BY analysis_id, skill")
+    assert [skill for _, skill in skills] == ['python', 'sql'] * 3
+
+
+def test_resumes_after_last_copied_row(database):
+    add_legacy(database, 2)
+    assert migrate(database) == 2
+    assert migrate(database) == 0
+    add_legacy(database, 2, start=2)
+    assert migrate(database) == 2
+    assert [row[0] for row in database.query("SELECT legacy_id FROM analyses ORDER BY ID")] == [1, 2, 3, 4]
@@ -0,0 +1,37 @@
+import datetime
+
+from Database import analysis_row, write_analyses
+from Search import SkillIndex
+
+
+def add(database, field, level, skills):
+    rows = write_analyses(database, [analysis_row('Name', 'name@example.com', 50, datetime.datetime(2024, 1, 1), 1,
+                                                  field, level, skills, [], [])])
+    return rows[0]
+
+
+def test_search_intersects_skills_and_facets(database):
+    ids = [add(database, 'Data Science', 'Fresher', ['Python', 'SQL'])['id'],
+           add(database, 'Data Science', 'Experienced', ['python', 'Pandas'])['id'],
+           add(database, 'Web Development', 'Fresher', ['JavaScript', 'SQL'])['id']]
+    index = SkillIndex(database)
+
+    assert index.search(all_skills=['PYTHON'])['ids'] == [ids[1], ids[0]]
+    assert index.search(all_skills=['python', 'sql'])['ids'] == [ids[0]]
+    assert index.search(any_skills=['pandas', 'javascript'])['ids'] == [ids[2], ids[1]]
+    assert index.search(all_skills=['sql'], level='Fresher', field='Web Development')['ids'] == [ids[2]]
+    assert index.search(all_skills=['cobol'])['total'] == 0
+
+    result = index.search(all_skills=['sql'], limit=1)
+    assert result['ids'] == [ids[2]] and result['total'] == 2
+    assert result['facets']['Predicted_Field'] == [('Data Science', 1), ('Web Development', 1)]
+
+
+def test_new_rows_are_found(database):
+    index = SkillIndex(database)
+    assert index.search()['total'] == 0
+    # Rows from the insert queue listener, and rows written by another process
+    index.add_rows([add(database, 'Data Science', 'Fresher', ['Python'])])
+    other = add(database, 'Data Science', 'Fresher', ['Python'])
+    assert index.search(all_skills=['python'])['ids'] == [other['id'], other['id'] - 1]
+    assert index.vocabulary() == ['Python']
@@ -0,0 +1,30 @@
+from Sections import score_resume
+
+
+def test_headings_on_their_own_line():
+    text = ('Jane Doe\n'
+            'CAREER OBJECTIVE\n'
+            'To build reliable systems.\n'
+            '  Projects:\n'
+            'Inventory tracker\n'
+            'Awards: Best intern 2023\n'
+            'Hobbies\n'
+            'Chess\n')
+    score, sections, positions = score_resume(text)
+    assert sections == {'Objective': True, 'Declaration': False, 'Hobbies/Interests': True,
+                        'Achievements': True, 'Projects': True}
+    assert score == 80
+    assert text[positions['Projects']:].startswith('Projects')
+
+
+def test_singular_and_plural_headings():
+    _, sections, _ = score_resume('PROJECT\nA thing\nInterest\nHiking\nDECLARATION\nAll true.')
+    assert sections['Projects'] and sections['Hobbies/Interests'] and sections['Declaration']
+
+
+def test_prose_mentioning_section_words_is_not_a_heading():
+    text = ('Led a project to reduce costs; no conflict of interest; '
+            'the objective was an award-winning product.\n'
+            'Projects were delivered on time and interests were aligned.')
+    assert score_resume(text) == (0, {'Objective': False, 'Declaration': False, 'Hobbies/Interests': False,
+                                      'Achievements': False, 'Projects': False}, {})
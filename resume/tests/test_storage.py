@@ -0,0 +1,51 @@
+import hashlib
+import io
+import os
+import time
+
+import pytest
+
+from Storage import UploadStore, UploadStoreFull, UploadTooLarge
+
+
+def make_store(tmp_path, **limits):
+    limits.setdefault('min_age', 0)
+    return UploadStore(root=str(tmp_path), **limits)
+
+
+def test_identical_uploads_are_stored_once(tmp_path):
+    store = make_store(tmp_path)
+    first = store.save(io.BytesIO(b'%PDF same'))
+    second = store.save(io.BytesIO(b'%PDF same'))
+    assert first.digest == hashlib.sha256(b'%PDF same').hexdigest()
+    assert first.path == second.path and not first.existed and second.existed
+    assert store.usage()['bytes'] == len(b'%PDF same')
+
+
+def test_file_size_limit(tmp_path):
+    store = make_store(tmp_path, max_file_bytes=10)
+    with pytest.raises(UploadTooLarge):
+        store.save(io.BytesIO(b'x' * 11))
+    with pytest.raises(UploadTooLarge):
+        store.save(io.BytesIO(b''), size_hint=11)
+    assert os.listdir(tmp_path / '.incoming') == []
+
+
+def test_eviction_keeps_other_files(tmp_path):
+    sample = tmp_path / 'sample_resume.pdf'
+    sample.write_bytes(b's' * 100)
+    store = make_store(tmp_path, max_total_bytes=100)
+    old = store.save(io.BytesIO(b'a' * 60))
+    os.utime(old.path, (time.time() - 60, time.time() - 60))
+    new = store.save(io.BytesIO(b'b' * 60))
+    assert not os.path.exists(old.path) and os.path.exists(new.path)
+    assert sample.exists()
+    assert store.usage()['bytes'] == 60
+
+
+def test_recent_uploads_are_not_evicted(tmp_path):
+    store = make_store(tmp_path, max_total_bytes=100, min_age=600)
+    kept = store.save(io.BytesIO(b'a' * 60))
+    with pytest.raises(UploadStoreFull):
+        store.save(io.BytesIO(b'b' * 60))
+    assert os.path.exists(kept.path)